@@ -0,0 +1,4 @@
+from facility_location.benchmark import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import time
+from facility_location.experiments import run_experiments, SOLVERS
+
+if __name__ == "__main__":
+    sizes = [100, 200]
+    radii = [75, 125]
+    maximum_facilities = [5, 10]
+    seeds = [0, 1]
+    solvers = SOLVERS
+    output_dir = "experiments"
+    max_workers = None
+
+    start_time = time.perf_counter()
+    rows = run_experiments(sizes, radii, maximum_facilities, seeds, solvers, output_dir, max_workers)
+    end_time = time.perf_counter()
+    print("Runs:", len(rows), "Errors:", sum(row["status"] != "ok" for row in rows))
+    print("Elapsed time:", end_time - start_time)
@@ -0,0 +1,4 @@
+from .instance_io import as_instance, load_instance, load_points_data, save_binary_instance, default_instance_path
+from .generator import build_instance
+from .streaming import build_instance_streaming
+from .solvers import solve_lscp, solve_mclp
@@ -0,0 +1,174 @@
+import argparse
+import json
+import math
+import multiprocessing as mp
+import os
+import platform
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from .generator import generate_population_columns, columns_to_points, all_points_with_radii, build_instance
+from .instance_io import load_instance, save_binary_instance
+from .solvers import solve_lscp, solve_mclp
+
+# Largest size each case runs at by default; beyond these the case takes
+# minutes (genetic) or CBC stops being tractable (exact).
+CASE_MAX_SIZES = {
+    "all_points_with_radii": 100000,
+    "greedy_LSCP": 100000,
+    "greedy_MCLP": 100000,
+    "genetic_LSCP": 10000,
+    "genetic_MCLP": 10000,
+    "exact_LSCP": 1000,
+    "exact_MCLP": 1000
+}
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+MAXIMUM_FACILITIES = 5
+
+def benchmark_radius(num_points, base_radius=125, base_points=100):
+    # Shrink the radius with the density so the mean neighbourhood size stays
+    # the same as in the 100-point reference instance.
+    return base_radius * math.sqrt(base_points / num_points)
+
+def write_instance(directory, num_points, seed):
+    x, y, weight = generate_population_columns(num_points, seed)
+    instance_dir = os.path.join(directory, f"instance_{num_points}")
+    save_binary_instance(instance_dir, build_instance(x, y, weight, benchmark_radius(num_points), MAXIMUM_FACILITIES))
+    return instance_dir
+
+def run_case(case, instance_dir, num_points, seed):
+    # Everything up to the returned closure runs before the clock starts: the
+    # instance is read fully, so only the solver (or the build) is timed.
+    instance = load_instance(instance_dir, mmap_mode=None)
+    if case == "all_points_with_radii":
+        points = columns_to_points(instance["x"], instance["y"], instance["weight"])
+        def build():
+            all_points_with_radii(points, instance["radius"], num_points, MAXIMUM_FACILITIES)
+        return build
+    if case == "greedy_LSCP":
+        return lambda: solve_lscp(instance, "greedy")["total_weight"]
+    if case == "greedy_MCLP":
+        return lambda: solve_mclp(instance, MAXIMUM_FACILITIES, "greedy")["total_points_covered"]
+    if case == "exact_LSCP":
+        return lambda: solve_lscp(instance, "exact")["total_weight"]
+    if case == "exact_MCLP":
+        return lambda: solve_mclp(instance, MAXIMUM_FACILITIES, "exact")["total_points_covered"]
+    if case == "genetic_LSCP":
+        return lambda: solve_lscp(instance, "genetic", seed=seed)["total_weight"]
+    if case == "genetic_MCLP":
+        return lambda: solve_mclp(instance, MAXIMUM_FACILITIES, "genetic", seed=seed)["total_points_covered"]
+    raise ValueError(f"Unknown case: {case}")
+
+def measure_case(case, instance_dir, num_points, seed, trace_memory=False):
+    # Runs in its own worker process, so ru_maxrss is the peak of this case
+    # only. tracemalloc slows allocation-heavy code down a lot, so traced runs
+    # are kept separate from the timed ones.
+    solve = run_case(case, instance_dir, num_points, seed)
+    if trace_memory:
+        tracemalloc.start()
+        solve()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"tracemalloc_peak_mb": peak / 2**20}
+    start_time = time.perf_counter()
+    objective = solve()
+    wall_time = time.perf_counter() - start_time
+    return {
+        "case": case,
+        "num_points": num_points,
+        "wall_time": wall_time,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+        "objective": None if objective is None else float(objective)
+    }
+
+def measure_in_subprocess(case, instance_dir, num_points, seed, trace_memory=False):
+    with mp.Pool(1, maxtasksperchild=1) as pool:
+        return pool.apply(measure_case, (case, instance_dir, num_points, seed, trace_memory))
+
+def add_quality(results):
+    exact = {(result["case"].split("_")[1], result["num_points"]): result["objective"] for result in results if result["case"].startswith("exact_")}
+    for result in results:
+        if result["objective"] is None or "_" not in result["case"]:
+            continue
+        problem = result["case"].rsplit("_", 1)[1]
+        exact_objective = exact.get((problem, result["num_points"]))
+        if exact_objective:
+            result["exact_objective"] = exact_objective
+            if problem == "LSCP":
+                result["gap"] = (result["objective"] - exact_objective) / exact_objective
+            else:
+                result["gap"] = (exact_objective - result["objective"]) / exact_objective
+    return results
+
+def run_benchmarks(cases=tuple(CASE_MAX_SIZES), sizes=DEFAULT_SIZES, seed=0, ignore_limits=False, trace_memory=False):
+    directory = tempfile.mkdtemp()
+    results = []
+    try:
+        for num_points in sizes:
+            selected = [case for case in cases if ignore_limits or num_points <= CASE_MAX_SIZES[case]]
+            if not selected:
+                continue
+            instance_dir = write_instance(directory, num_points, seed)
+            for case in selected:
+                result = measure_in_subprocess(case, instance_dir, num_points, seed)
+                if trace_memory:
+                    result.update(measure_in_subprocess(case, instance_dir, num_points, seed, True))
+                print(f"{case:>22} n={num_points:<7} {result['wall_time']:10.4f} s {result['peak_rss_mb']:10.1f} MB RSS")
+                results.append(result)
+    finally:
+        shutil.rmtree(directory)
+    return add_quality(results)
+
+def save_baseline(results, baseline_file, seed):
+    baseline = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "seed": seed,
+        "results": results
+    }
+    with open(baseline_file, "w") as file:
+        json.dump(baseline, file, indent=2)
+
+def compare_to_baseline(results, baseline_file, time_tolerance=1.5, memory_tolerance=1.5):
+    with open(baseline_file, "r") as file:
+        baseline = {(result["case"], result["num_points"]): result for result in json.load(file)["results"]}
+    regressions = []
+    for result in results:
+        reference = baseline.get((result["case"], result["num_points"]))
+        if reference is None:
+            continue
+        if result["wall_time"] > time_tolerance * reference["wall_time"]:
+            regressions.append((result["case"], result["num_points"], "wall_time", reference["wall_time"], result["wall_time"]))
+        for metric in ("peak_rss_mb", "tracemalloc_peak_mb"):
+            if metric in result and metric in reference and result[metric] > memory_tolerance * max(reference[metric], 1.0):
+                regressions.append((result["case"], result["num_points"], metric, reference[metric], result[metric]))
+        if "gap" in reference and result.get("gap", 0) > reference["gap"] + 1e-9:
+            regressions.append((result["case"], result["num_points"], "gap", reference["gap"], result["gap"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmarks for instance construction and all solvers.")
+    parser.add_argument("--cases", nargs="+", default=list(CASE_MAX_SIZES), choices=list(CASE_MAX_SIZES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ignore-limits", action="store_true", help="run every case at every size")
+    parser.add_argument("--tracemalloc", action="store_true", help="also measure the traced Python heap peak in a second run")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a new baseline")
+    parser.add_argument("--compare", metavar="FILE", help="fail if results regress against this baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown / memory growth factor")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.cases, args.sizes, args.seed, args.ignore_limits, args.tracemalloc)
+    if args.save:
+        save_baseline(results, args.save, args.seed)
+    if args.compare:
+        regressions = compare_to_baseline(results, args.compare, args.tolerance, args.tolerance)
+        for case, num_points, metric, reference, value in regressions:
+            print(f"REGRESSION {case} n={num_points} {metric}: {reference:.4g} -> {value:.4g}")
+        if regressions:
+            raise SystemExit(1)
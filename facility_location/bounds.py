@@ -0,0 +1,114 @@
+import math
+import numpy as np
+from .instance_io import as_instance
+
+# Bounds on the optimum for stopping heuristics early and reporting gaps.
+# Both relax the covering constraints with Lagrange multipliers u[e] >= 0 and
+# improve them by subgradient steps, which only needs the CSR arrays.
+
+def coverage_matrix_products(indptr, indices):
+    n = len(indptr) - 1
+    facility_of_entry = np.repeat(np.arange(n), np.diff(indptr))
+    # u summed over the elements of every facility, and x summed over the
+    # facilities covering every element.
+    def facility_sums(u):
+        return np.bincount(facility_of_entry, weights=u[indices], minlength=n)
+    def element_sums(x):
+        return np.bincount(indices, weights=x[facility_of_entry], minlength=n)
+    return facility_sums, element_sums
+
+def polyak_step(step_size, target, value, subgradient):
+    norm = float(subgradient @ subgradient)
+    return 0.0 if norm == 0 else step_size * abs(target - value) / norm
+
+def lscp_lower_bound(instance, upper_bound=None, iterations=300, patience=20):
+    # L(u) = sum(u) + sum_j min(0, w_j - sum_{e in N(j)} u_e) <= OPT for u >= 0.
+    instance = as_instance(instance)
+    indptr, indices = np.asarray(instance["indptr"]), np.asarray(instance["indices"])
+    weights = np.asarray(instance["weight"], dtype=float)
+    facility_sums, element_sums = coverage_matrix_products(indptr, indices)
+    if upper_bound is None:
+        upper_bound = float(weights.sum())
+    # Start from the cheapest cost per element any covering facility offers.
+    u = np.full(len(weights), np.inf)
+    np.minimum.at(u, indices, np.repeat(weights / np.maximum(np.diff(indptr), 1), np.diff(indptr)))
+    u[np.isinf(u)] = 0.0
+    best, step_size, stalled = -np.inf, 2.0, 0
+    for _ in range(iterations):
+        reduced_costs = weights - facility_sums(u)
+        x = (reduced_costs < 0).astype(float)
+        value = u.sum() + reduced_costs[reduced_costs < 0].sum()
+        if value > best + 1e-9:
+            best, stalled = value, 0
+        else:
+            stalled += 1
+            if stalled >= patience:
+                step_size, stalled = step_size / 2, 0
+        if best >= upper_bound - 1e-9 or step_size < 1e-4:
+            break
+        subgradient = 1.0 - element_sums(x)
+        u = np.maximum(0.0, u + polyak_step(step_size, upper_bound, value, subgradient) * subgradient)
+    # Integer weights make the optimum an integer.
+    return float(math.ceil(best - 1e-6))
+
+def top_sum(values, count):
+    count = min(count, len(values))
+    return float(np.partition(values, len(values) - count)[len(values) - count:].sum()) if count > 0 else 0.0
+
+def submodular_upper_bound(instance, facilities, maximumFacilities, demand):
+    # Coverage is submodular, so from any selection S:
+    # OPT <= f(S) + sum of the p largest marginal gains with respect to S.
+    indptr, indices = np.asarray(instance["indptr"]), np.asarray(instance["indices"])
+    n = len(indptr) - 1
+    covered = np.zeros(n, dtype=bool)
+    for facility in facilities:
+        covered[indices[indptr[facility]:indptr[facility + 1]]] = True
+    facility_of_entry = np.repeat(np.arange(n), np.diff(indptr))
+    gains = np.bincount(facility_of_entry, weights=demand[indices] * ~covered[indices], minlength=n)
+    return float(demand[covered].sum()) + top_sum(gains, maximumFacilities)
+
+def mclp_upper_bound(instance, maximumFacilities=None, weighted=False, facilities=None, lower_bound=None, iterations=300, patience=20):
+    # L(u) = sum_e max(0, d_e - u_e) + (sum of the p largest sum_{e in N(j)} u_e)
+    # >= OPT for u >= 0; with a selection the submodular bound is tried too.
+    instance = as_instance(instance)
+    if maximumFacilities is None:
+        maximumFacilities = instance["maximumFacilities"]
+    indptr, indices = np.asarray(instance["indptr"]), np.asarray(instance["indices"])
+    n = len(indptr) - 1
+    demand = np.asarray(instance["weight"], dtype=float) if weighted else np.ones(n)
+    facility_sums, element_sums = coverage_matrix_products(indptr, indices)
+    best = float(demand.sum())
+    if facilities is not None:
+        best = min(best, submodular_upper_bound(instance, facilities, maximumFacilities, demand))
+    if lower_bound is None:
+        lower_bound = 0.0
+    u = demand / 2
+    step_size, stalled = 2.0, 0
+    for _ in range(iterations):
+        sums = facility_sums(u)
+        chosen = np.argpartition(-sums, min(maximumFacilities, n) - 1)[:maximumFacilities]
+        value = np.maximum(0.0, demand - u).sum() + sums[chosen].sum()
+        if value < best - 1e-9:
+            best, stalled = value, 0
+        else:
+            stalled += 1
+            if stalled >= patience:
+                step_size, stalled = step_size / 2, 0
+        if best <= lower_bound + 1e-9 or step_size < 1e-4:
+            break
+        x = np.zeros(n)
+        x[chosen] = 1.0
+        subgradient = element_sums(x) - (demand > u)
+        u = np.maximum(0.0, u - polyak_step(step_size, lower_bound, value, subgradient) * subgradient)
+    return float(math.floor(best + 1e-6))
+
+def relative_gap(incumbent, bound):
+    if incumbent is None or bound is None:
+        return None
+    if incumbent == 0:
+        return 0.0 if bound == 0 else None
+    return abs(bound - incumbent) / abs(incumbent)
+
+def within_gap(incumbent, bound, target_gap):
+    gap = relative_gap(incumbent, bound)
+    return gap is not None and gap <= target_gap
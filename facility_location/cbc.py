@@ -0,0 +1,37 @@
+import os
+import re
+import tempfile
+import pulp
+from .bounds import relative_gap
+
+BOUND_PATTERN = re.compile(r"^(?:Lower|Upper) bound:\s+(\S+)", re.MULTILINE)
+RESULT_PATTERN = re.compile(r"^Result - (.+)$", re.MULTILINE)
+
+def solve_with_limits(problem, time_limit=None, gap=None, warm_start=False, msg=True):
+    # CBC only reports the best bound in its log, so the log is captured to a
+    # temporary file and parsed; with msg it is echoed afterwards.
+    log_file, log_path = tempfile.mkstemp(suffix=".log")
+    os.close(log_file)
+    try:
+        problem.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit, gapRel=gap, warmStart=warm_start, logPath=log_path))
+        with open(log_path, "r") as file:
+            log = file.read()
+    finally:
+        os.remove(log_path)
+    if msg:
+        print(log)
+
+    has_solution = problem.sol_status in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible)
+    incumbent = pulp.value(problem.objective) if has_solution else None
+    bound = BOUND_PATTERN.search(log)
+    if bound is not None:
+        bound = float(bound.group(1))
+    elif problem.sol_status == pulp.LpSolutionOptimal:
+        bound = incumbent
+    result = RESULT_PATTERN.search(log)
+    return {
+        "status": result.group(1).strip() if result else pulp.LpStatus[problem.status],
+        "has_solution": has_solution,
+        "incumbent": incumbent,
+        "bound": bound
+    }
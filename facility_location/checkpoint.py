@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+# A checkpoint is one .npz file: the population (bit-packed when it is a 0/1
+# matrix), the fitness values and a JSON header with the counters, the
+# generator state and the run's meta data. Anything else in a state (e.g.
+# the LSCP duplicate index) is rebuilt from the population on resume.
+
+SKIPPED_FIELDS = ("population", "fitness_values", "rng", "members", "instrumentation")
+
+def instance_hash(*arrays):
+    # Part of a run's meta data: an instance changed in place (same number of
+    # points) must not resume a run made on the old one. Index arrays are
+    # hashed as int64, so int32 and int64 copies of an instance agree.
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=np.int64 if np.issubdtype(np.asarray(array).dtype, np.integer) else float)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+def save_checkpoint(path, state, meta):
+    population = np.asarray(state["population"])
+    arrays = {"fitness_values": np.asarray(state["fitness_values"])}
+    if population.dtype == np.uint8 and population.ndim == 2:
+        arrays["population_bits"] = np.packbits(population, axis=1)
+        arrays["population_shape"] = np.asarray(population.shape, dtype=np.int64)
+    else:
+        arrays["population"] = population
+    header = {
+        "meta": meta,
+        "state": {key: value for key, value in state.items() if key not in SKIPPED_FIELDS},
+        "rng": state["rng"].bit_generator.state
+    }
+    arrays["header"] = np.frombuffer(json.dumps(header, default=lambda value: value.item()).encode(), dtype=np.uint8)
+    # Written next to the target and renamed, so a kill mid-write keeps the
+    # previous checkpoint intact.
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(temporary_path, path)
+
+def load_checkpoint(path):
+    with np.load(path) as data:
+        header = json.loads(data["header"].tobytes().decode())
+        if "population_bits" in data:
+            shape = tuple(data["population_shape"].tolist())
+            population = np.unpackbits(data["population_bits"], axis=1, count=shape[1])
+        else:
+            population = data["population"]
+        state = dict(header["state"], population=population, fitness_values=data["fitness_values"])
+    rng = np.random.default_rng()
+    rng.bit_generator.state = header["rng"]
+    state["rng"] = rng
+    return state, header["meta"]
+
+def resume_state(path, meta):
+    # The saved run must match the one being resumed; the instance and the
+    # operator parameters decide every later generation.
+    state, saved_meta = load_checkpoint(path)
+    if saved_meta.get("instance_hash") != meta.get("instance_hash"):
+        raise ValueError(f"Checkpoint {path} was saved for a different instance")
+    if saved_meta != meta:
+        differing = sorted(key for key in set(saved_meta) | set(meta) if saved_meta.get(key) != meta.get(key))
+        raise ValueError(f"Checkpoint {path} belongs to a different run (differs in: {', '.join(differing)})")
+    return state
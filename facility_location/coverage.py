@@ -0,0 +1,39 @@
+import numpy as np
+
+def covered_by_index(indptr, indices, num_elements, weights=None):
+    # Transpose of the coverage CSR: for every element, the ids of the sets
+    # that cover it, in ascending set id order, or by (weight, set id) when
+    # weights are given.
+    indptr = np.asarray(indptr)
+    indices = np.asarray(indices)
+    set_ids = np.repeat(np.arange(len(indptr) - 1, dtype=indices.dtype), np.diff(indptr))
+    if weights is None:
+        order = np.argsort(indices, kind="stable")
+    else:
+        order = np.lexsort((set_ids, np.asarray(weights)[set_ids], indices))
+    covered_by_indptr = np.zeros(num_elements + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=num_elements), out=covered_by_indptr[1:])
+    return covered_by_indptr, set_ids[order]
+
+def gather_rows(indptr, indices, rows):
+    # Concatenation of indices[indptr[r]:indptr[r + 1]] for every r in rows,
+    # together with the length of each row.
+    indptr = np.asarray(indptr)
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return np.asarray(indices)[offsets + np.arange(offsets.size)], lengths
+
+def coverage_index(indptr, indices, num_elements, weights=None):
+    covered_by_indptr, covered_by_indices = covered_by_index(indptr, indices, num_elements, weights)
+    return {
+        "indptr": np.asarray(indptr),
+        "indices": np.asarray(indices),
+        "covered_by_indptr": covered_by_indptr,
+        "covered_by_indices": covered_by_indices
+    }
+
+def coverage_counts(coverage, selected_sets, num_elements):
+    elements, _ = gather_rows(coverage["indptr"], coverage["indices"], selected_sets)
+    return np.bincount(elements, minlength=num_elements)
@@ -0,0 +1,71 @@
+import pulp
+from .instance_io import as_instance
+from .presolve import presolve_set_cover, map_back
+from .cbc import solve_with_limits, relative_gap
+
+def starting_columns(start, column_ids, indptr, indices, weights):
+    # Map a full-instance solution into the reduced problem and cover any row
+    # it misses (its facilities may have been removed as dominated) with the
+    # cheapest remaining facility.
+    local = {j: position for position, j in enumerate(column_ids)}
+    columns = {local[j] for j in start if j in local}
+    for i in range(len(indptr) - 1):
+        row = indices[indptr[i]:indptr[i + 1]]
+        if not columns.intersection(row):
+            columns.add(min(row, key=lambda j: (weights[j], j)))
+    return columns
+
+def set_covering(instance, presolve=True, start=None, time_limit=None, gap=None, msg=True):
+    instance = as_instance(instance)
+    fixed_weight = 0
+    if presolve:
+        presolved = presolve_set_cover(instance["indptr"], instance["indices"], instance["weight"])
+        stats = presolved["stats"]
+        if msg:
+            print(f"Presolve: {stats['original_rows']} -> {stats['rows']} rows, {stats['original_columns']} -> {stats['columns']} columns, {stats['fixed']} facilities fixed")
+        indptr, indices = presolved["indptr"].tolist(), presolved["indices"].tolist()
+        weights = presolved["weight"]
+        column_ids = presolved["column_ids"]
+        fixed_weight = int(sum(instance["weight"][j] for j in presolved["fixed"]))
+    else:
+        indptr, indices = instance["indptr"].tolist(), instance["indices"].tolist()
+        weights = instance["weight"].tolist()
+        column_ids = range(len(weights))
+    ids = range(len(weights))
+    rows = range(len(indptr) - 1)
+
+    selected_points = []
+    solve_info = {"status": "Optimal solution found", "has_solution": True, "incumbent": 0, "bound": 0}
+    if len(rows) > 0:
+        selected = pulp.LpVariable.dicts("Selected", ids, cat=pulp.LpBinary)
+        set_covering_problem = pulp.LpProblem("SetCoveringProblem", pulp.LpMinimize)
+        set_covering_problem += pulp.lpSum(selected[i]*weights[i] for i in ids)
+
+        for i in rows:
+            set_covering_problem += pulp.lpSum(selected[point_id] for point_id in indices[indptr[i]:indptr[i + 1]]) >= 1
+
+        if start is not None:
+            start_columns = starting_columns(start, column_ids, indptr, indices, weights)
+            for i in ids:
+                selected[i].setInitialValue(1 if i in start_columns else 0)
+
+        solve_info = solve_with_limits(set_covering_problem, time_limit, gap, start is not None, msg)
+        if solve_info["has_solution"]:
+            selected_points = [i for i in ids if selected[i].value() == 1]
+
+    result = {}
+    if presolve:
+        selected_points = map_back(presolved, selected_points) if solve_info["has_solution"] else []
+        result["presolve"] = stats
+    incumbent = solve_info["incumbent"] + fixed_weight if solve_info["incumbent"] is not None else None
+    bound = solve_info["bound"] + fixed_weight if solve_info["bound"] is not None else None
+    result = {
+        "result": selected_points,
+        "total_weight": float(sum(instance["weight"][i] for i in selected_points)) if solve_info["has_solution"] else None,
+        "status": solve_info["status"],
+        "incumbent": incumbent,
+        "bound": bound,
+        "gap": relative_gap(incumbent, bound),
+        **result
+    }
+    return result
@@ -0,0 +1,38 @@
+import pulp
+from .instance_io import as_instance
+from .cbc import solve_with_limits, relative_gap
+
+def set_covering(instance, maximumFacilities=None, start=None, time_limit=None, gap=None, msg=True):
+    instance = as_instance(instance)
+    if maximumFacilities is None:
+        maximumFacilities = instance["maximumFacilities"]
+    indptr, indices = instance["indptr"].tolist(), instance["indices"].tolist()
+    ids = range(len(indptr) - 1)
+
+    selectedFacilities = pulp.LpVariable.dicts("selectedFacilities", ids, cat=pulp.LpBinary)
+    selectedPoints = pulp.LpVariable.dicts("selectedPoints", ids, cat=pulp.LpBinary)
+    set_covering_problem = pulp.LpProblem("SetCoveringProblem", pulp.LpMaximize)
+    set_covering_problem += pulp.lpSum(selectedPoints[i] for i in ids)
+
+    for i in ids:
+        set_covering_problem += pulp.lpSum(selectedFacilities[point_id] for point_id in indices[indptr[i]:indptr[i + 1]]) >= selectedPoints[i]
+
+    set_covering_problem += pulp.lpSum(selectedFacilities[i] for i in ids) <= maximumFacilities
+
+    if start is not None:
+        start_facilities = set(list(start)[:maximumFacilities])
+        for i in ids:
+            selectedFacilities[i].setInitialValue(1 if i in start_facilities else 0)
+            selectedPoints[i].setInitialValue(1 if start_facilities.intersection(indices[indptr[i]:indptr[i + 1]]) else 0)
+
+    solve_info = solve_with_limits(set_covering_problem, time_limit, gap, start is not None, msg)
+    selected_points = [i for i in ids if selectedFacilities[i].value() == 1] if solve_info["has_solution"] else []
+    result = {
+        "result": selected_points,
+        "total_points_covered": solve_info["incumbent"],
+        "status": solve_info["status"],
+        "incumbent": solve_info["incumbent"],
+        "bound": solve_info["bound"],
+        "gap": relative_gap(solve_info["incumbent"], solve_info["bound"])
+    }
+    return result
@@ -0,0 +1,121 @@
+import csv
+import itertools
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from .generator import generate_population_columns
+from .streaming import build_instance_streaming
+from .instance_io import load_instance
+from .solvers import solve_lscp, solve_mclp
+
+SOLVERS = ("exact_LSCP", "greedy_LSCP", "genetic_LSCP", "exact_MCLP", "greedy_MCLP", "genetic_MCLP")
+
+RESULT_FIELDS = [
+    "problem", "solver", "num_points", "radius", "maximumFacilities", "seed",
+    "objective", "wall_time", "exact_objective", "gap", "status", "run_dir"
+]
+
+def problem_of(solver):
+    return solver.rsplit("_", 1)[1]
+
+def instance_dir(output_dir, num_points, radius, seed):
+    return os.path.join(output_dir, f"n{num_points}_r{radius}_s{seed}")
+
+def binary_dir(output_dir, num_points, radius, seed):
+    return os.path.join(instance_dir(output_dir, num_points, radius, seed), "population_points_bin")
+
+def write_instance(output_dir, num_points, radius, seed):
+    # Tiled, so parallel workers stay within memory on large sizes. The
+    # sentinel is written last: a directory without it is a partial build.
+    directory = instance_dir(output_dir, num_points, radius, seed)
+    done_file = os.path.join(directory, "done")
+    if not os.path.exists(done_file):
+        os.makedirs(directory, exist_ok=True)
+        x, y, weight = generate_population_columns(num_points, seed)
+        build_instance_streaming(x, y, weight, radius, binary_dir(output_dir, num_points, radius, seed))
+        open(done_file, "w").close()
+    return binary_dir(output_dir, num_points, radius, seed)
+
+def solve(solver, instance, instance_file, maximumFacilities, seed):
+    method, problem = solver.split("_")
+    # The CBC log would interleave across the parallel workers.
+    params = {"msg": False} if method == "exact" else None
+    if problem == "LSCP":
+        return solve_lscp(instance, method, seed=seed, params=params)
+    return solve_mclp(instance, maximumFacilities, method, seed=seed, params=params, instance_file=instance_file if method == "genetic" else None)
+
+def run_job(job, output_dir):
+    solver, num_points, radius, maximumFacilities, seed = job
+    row = {
+        "problem": problem_of(solver),
+        "solver": solver,
+        "num_points": num_points,
+        "radius": radius,
+        "maximumFacilities": maximumFacilities,
+        "seed": seed
+    }
+    directory = instance_dir(output_dir, num_points, radius, seed)
+    run_dir = os.path.join(directory, solver if maximumFacilities is None else f"{solver}_p{maximumFacilities}")
+    row["run_dir"] = run_dir
+    try:
+        # Read fully before the clock starts, so the timing covers the solver
+        # only and not parsing or paging in the instance.
+        instance_file = binary_dir(output_dir, num_points, radius, seed)
+        instance = load_instance(instance_file, mmap_mode=None)
+        os.makedirs(run_dir, exist_ok=True)
+        start_time = time.perf_counter()
+        solution = solve(solver, instance, instance_file, maximumFacilities, seed)
+        row["wall_time"] = time.perf_counter() - start_time
+        row["objective"] = solution["total_weight"] if row["problem"] == "LSCP" else solution["total_points_covered"]
+        row["status"] = "ok"
+        with open(os.path.join(run_dir, f"{solver.split('_')[0]}_solution_{row['problem']}.json"), "w") as file:
+            json.dump(solution, file, indent=2)
+    except Exception:
+        row["status"] = "error"
+        with open(os.path.join(run_dir, "error.txt"), "w") as file:
+            file.write(traceback.format_exc())
+    return row
+
+def experiment_grid(sizes, radii, maximum_facilities, seeds, solvers):
+    jobs = []
+    for num_points, radius, seed, solver in itertools.product(sizes, radii, seeds, solvers):
+        if problem_of(solver) == "LSCP":
+            jobs.append((solver, num_points, radius, None, seed))
+        else:
+            jobs.extend((solver, num_points, radius, p, seed) for p in maximum_facilities)
+    return jobs
+
+def add_exact_gaps(rows):
+    exact = {}
+    for row in rows:
+        if row["solver"].startswith("exact_") and row["status"] == "ok":
+            exact[(row["problem"], row["num_points"], row["radius"], row["maximumFacilities"], row["seed"])] = row["objective"]
+    for row in rows:
+        exact_objective = exact.get((row["problem"], row["num_points"], row["radius"], row["maximumFacilities"], row["seed"]))
+        row["exact_objective"] = exact_objective
+        if exact_objective and row.get("objective") is not None:
+            if row["problem"] == "LSCP":
+                row["gap"] = (row["objective"] - exact_objective) / exact_objective
+            else:
+                row["gap"] = (exact_objective - row["objective"]) / exact_objective
+    return rows
+
+def write_results(rows, results_file):
+    with open(results_file, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({field: row.get(field) for field in RESULT_FIELDS})
+
+def run_experiments(sizes, radii, maximum_facilities, seeds, solvers=SOLVERS, output_dir="experiments", max_workers=None):
+    os.makedirs(output_dir, exist_ok=True)
+    instances = sorted(set(itertools.product(sizes, radii, seeds)))
+    jobs = experiment_grid(sizes, radii, maximum_facilities, seeds, solvers)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(write_instance, itertools.repeat(output_dir), *zip(*instances)))
+        rows = list(executor.map(run_job, jobs, itertools.repeat(output_dir)))
+    rows = add_exact_gaps(rows)
+    write_results(rows, os.path.join(output_dir, "results.csv"))
+    return rows
@@ -0,0 +1,124 @@
+import numpy as np
+from .instance_io import index_dtype
+
+def generate_population_columns(n, seed=None):
+    center_x, center_y = 0, 0
+    max_distance = 500
+
+    rng = np.random.default_rng(seed)
+    x = np.empty(n)
+    y = np.empty(n)
+    pending = np.arange(n)
+    while len(pending) > 0:
+        radii = rng.normal(loc=0, scale=max_distance/2, size=len(pending))
+        angle = rng.uniform(0, 2*np.pi, size=len(pending))
+        x_coord = center_x + radii * np.cos(angle)
+        y_coord = center_y + radii * np.sin(angle)
+        accepted = (np.abs(x_coord) <= max_distance) & (np.abs(y_coord) <= max_distance)
+        x[pending[accepted]] = x_coord[accepted]
+        y[pending[accepted]] = y_coord[accepted]
+        pending = pending[~accepted]
+    weight = rng.integers(1, 4, size=n)
+    return x, y, weight
+
+def columns_to_points(x, y, weight):
+    return [{"id": i, "x": float(x_i), "y": float(y_i), "weight": int(w_i)} for i, (x_i, y_i, w_i) in enumerate(zip(x, y, weight))]
+
+def pair_distances(x1, y1, x2, y2):
+    # Every neighbour search goes through this expression, so a <= radius test
+    # gives the same answer whichever search made it.
+    return np.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+
+def distance(point1, point2):
+    return pair_distances(point1["x"], point1["y"], point2["x"], point2["y"])
+
+def points_within_radius(all_points, center_point, radius):
+    within_radius = [point for point in all_points if distance(center_point, point) <= radius]
+    return within_radius
+
+def grid_cells(x, y, cell_size):
+    cells = {}
+    cell_x = np.floor(x / cell_size).astype(np.int64)
+    cell_y = np.floor(y / cell_size).astype(np.int64)
+    for i, cell in enumerate(zip(cell_x.tolist(), cell_y.tolist())):
+        cells.setdefault(cell, []).append(i)
+    return {cell: np.array(members, dtype=np.int64) for cell, members in cells.items()}
+
+def grid_cell_size(radius):
+    return radius * (1 + 1e-9) if radius > 0 else 1.0
+
+def cell_pair_distances(x, y, radius, rows=None, block_entries=None):
+    # Bucket the points into square cells of side >= radius, so every neighbour
+    # of a point lies in its own cell or one of the eight surrounding cells.
+    # Yields (positions, candidates, distances) per cell: rows[positions] (or
+    # just positions when rows is None) are points in the cell, candidates the
+    # points in it and around it sorted by id, and distances the matrix between
+    # the two, in blocks of about block_entries entries if given.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    cell_size = grid_cell_size(radius)
+    cells = grid_cells(x, y, cell_size)
+    row_cells = cells if rows is None else grid_cells(x[rows], y[rows], cell_size)
+    for (cx, cy), positions in row_cells.items():
+        candidates = np.sort(np.concatenate([cells[(cx + dx, cy + dy)] for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (cx + dx, cy + dy) in cells]))
+        points = positions if rows is None else rows[positions]
+        block = len(positions) if block_entries is None else max(1, block_entries // len(candidates))
+        for first in range(0, len(positions), block):
+            block_points = points[first:first + block]
+            yield positions[first:first + block], candidates, pair_distances(x[block_points][:, None], y[block_points][:, None], x[candidates][None, :], y[candidates][None, :])
+
+def grid_points_within_radius(x, y, radius):
+    neighbours = [None] * len(x)
+    for members, candidates, distances in cell_pair_distances(x, y, radius):
+        within = distances <= radius
+        for row, member in enumerate(members.tolist()):
+            neighbours[member] = candidates[within[row]]
+    return neighbours
+
+def all_points_with_radii(points, radius=50, total_points=100,maximumFacilities=5, method="grid"):
+    points_with_radii = {
+        "radius": radius,
+        "maximumFacilities":maximumFacilities,
+        "total_points": total_points,
+        "points_data": []
+    }
+    if method == "grid":
+        ids = np.array([point["id"] for point in points])
+        neighbours = grid_points_within_radius([point["x"] for point in points], [point["y"] for point in points], radius)
+        nearby_ids = [ids[members].tolist() for members in neighbours]
+    elif method == "brute":
+        nearby_ids = [[p["id"] for p in points_within_radius(points, point, radius)] for point in points]
+    else:
+        raise ValueError(f"Unknown method: {method}")
+    for point, nearby in zip(points, nearby_ids):
+        points_with_radii["points_data"].append({
+            "id": point["id"],
+            "x": point["x"],
+            "y": point["y"],
+            "weight": point["weight"],
+            "points_within_radius": nearby
+        })
+    return points_with_radii
+
+def check_points_within_radius(points, radius):
+    grid = all_points_with_radii(points, radius, method="grid")["points_data"]
+    brute = all_points_with_radii(points, radius, method="brute")["points_data"]
+    mismatches = [g["id"] for g, b in zip(grid, brute) if g["points_within_radius"] != b["points_within_radius"]]
+    return mismatches
+
+def build_instance(x, y, weight, radius, maximumFacilities=None):
+    neighbours = grid_points_within_radius(x, y, radius)
+    n = len(neighbours)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(members) for members in neighbours], out=indptr[1:])
+    indices = np.concatenate(neighbours).astype(index_dtype(n)) if n > 0 else np.zeros(0, dtype=index_dtype(n))
+    return {
+        "radius": radius,
+        "maximumFacilities": maximumFacilities,
+        "total_points": n,
+        "x": np.asarray(x, dtype=float),
+        "y": np.asarray(y, dtype=float),
+        "weight": np.asarray(weight, dtype=np.int64),
+        "indptr": indptr,
+        "indices": indices
+    }
@@ -0,0 +1,444 @@
+import random
+import math
+import os
+import numpy as np
+from collections import Counter
+from .instance_io import as_instance
+from .coverage import coverage_index, coverage_counts, gather_rows
+from .bounds import within_gap
+from .instrumentation import run_operator, wants_record, record_generation, matrix_diversity
+from .checkpoint import save_checkpoint, resume_state, instance_hash
+
+def create_initial_feasible_solution_as_chromosome(points_data):
+    elements_to_cover = [point['id'] for point in points_data]
+    sets = [set(point['points_within_radius']) for point in points_data]
+    selected_set_ids = []
+    coverage_count = {element: 0 for element in elements_to_cover}
+    for element in elements_to_cover:
+        covering_sets = [s for s in sets if element in s]
+        if not covering_sets:
+            print("No set covers element:", element)
+            continue
+        selected_set = random.choice(covering_sets)
+        selected_set_ids.append(sets.index(selected_set))
+        for covered_element in selected_set:
+            coverage_count[covered_element] += 1
+    clone_selected_set_ids = selected_set_ids.copy()
+    while clone_selected_set_ids:
+        selected_set_id = random.choice(clone_selected_set_ids)
+        clone_selected_set_ids.remove(selected_set_id)
+        selected_set = sets[selected_set_id]
+        remove_set_from_selected = True
+        for covered_element in selected_set:
+            if coverage_count[covered_element] < 2:
+                remove_set_from_selected = False
+                break
+        if remove_set_from_selected:
+            for covered_element in selected_set:
+                coverage_count[covered_element] -= 1
+            selected_set_ids.remove(selected_set_id)
+    num_sets = len(sets)
+    selected_sets_array = [1 if i in selected_set_ids else 0 for i in range(num_sets)]
+    return selected_sets_array, coverage_count
+
+def generate_initial_population(points_data, n):
+    population = []
+    for _ in range(n):
+        solution, _ = create_initial_feasible_solution_as_chromosome(points_data)
+        population.append(solution)
+    return population
+
+def create_initial_feasible_solution_indexed(coverage, rng):
+    indptr, indices = coverage["indptr"], coverage["indices"]
+    covered_by_indptr, covered_by_indices = coverage["covered_by_indptr"], coverage["covered_by_indices"]
+    num_sets = len(indptr) - 1
+    num_covering_sets = np.diff(covered_by_indptr)
+    for element in np.flatnonzero(num_covering_sets == 0).tolist():
+        print("No set covers element:", element)
+    elements = np.flatnonzero(num_covering_sets)
+    offsets = (rng.random(len(elements)) * num_covering_sets[elements]).astype(np.int64)
+    selected_set_ids = covered_by_indices[covered_by_indptr[elements] + offsets]
+    coverage_count = coverage_counts(coverage, selected_set_ids, len(num_covering_sets))
+    # Counts only go down, so sets that are not removable now never will be.
+    removable = np.zeros(num_sets, dtype=bool)
+    non_empty = np.flatnonzero(np.diff(indptr) > 0)
+    removable[non_empty] = np.minimum.reduceat(coverage_count[indices], indptr[non_empty]) >= 2
+    copies = np.bincount(selected_set_ids, minlength=num_sets)
+    removal_order = rng.permutation(selected_set_ids)
+    for selected_set_id in removal_order[removable[removal_order]].tolist():
+        covered_elements = indices[indptr[selected_set_id]:indptr[selected_set_id + 1]]
+        if coverage_count[covered_elements].min() >= 2:
+            coverage_count[covered_elements] -= 1
+            copies[selected_set_id] -= 1
+    return (copies > 0).astype(np.uint8), coverage_count
+
+def generate_initial_population_indexed(n, coverage, rng):
+    return np.array([create_initial_feasible_solution_indexed(coverage, rng)[0] for _ in range(n)], dtype=np.uint8)
+
+def fitness_function(points_data, solution):
+    total_weight = 0
+    for i, selected in enumerate(solution):
+        if selected == 1:
+            total_weight += points_data[i]['weight']
+    return total_weight
+
+def binary_tournament_selection(points_data, population):
+    selected_solutions = []
+    for _ in range(2):
+        tournament_pool = random.sample(range(len(population)), 2)
+        solution1, solution2 = tournament_pool
+        fitness1 = fitness_function(points_data, population[solution1])
+        fitness2 = fitness_function(points_data, population[solution2])
+        if fitness1 < fitness2:
+            selected_solutions.append(population[solution1])
+        else:
+            selected_solutions.append(population[solution2])
+    return selected_solutions
+
+def form_new_solution_by_crossover(points_data, solution1, solution2):
+    child_solution = []
+    fitness1 = fitness_function(points_data, solution1)
+    fitness2 = fitness_function(points_data, solution2)
+    probability = fitness2 / (fitness1 + fitness2)
+    for i in range(len(solution1)):
+        if solution1[i] == solution2[i]:
+            child_solution.append(solution1[i])
+        else:
+            if random.random() < probability:
+                child_solution.append(solution1[i])
+            else:
+                child_solution.append(solution2[i])
+    return child_solution
+
+def number_of_bits_mutated(mf, mc, mg, t):
+    exponent = -4 * mg * (t - mc) / mf
+    return mf / (1 + math.exp(exponent))
+
+def s_elite(points_data, num_elite_sets=5):
+    elite_sets = {}
+    for point in points_data:
+        element_id = point['id']
+        sets_that_cover_point = []
+        for other_point in points_data:
+            if element_id in other_point['points_within_radius']:
+                sets_that_cover_point.append(other_point['id'])
+        sorted_sets = sorted(sets_that_cover_point, key=lambda set_id: points_data[set_id]['weight'])
+        elite_sets[element_id] = sorted_sets[:num_elite_sets]
+    union_of_elite_sets = set()
+    for sets in elite_sets.values():
+        union_of_elite_sets.update(sets)
+    return union_of_elite_sets
+
+def s_elite_indexed(coverage, num_elite_sets=5):
+    # covered_by rows are sorted by (weight, set id), so the elite sets of an
+    # element are the first num_elite_sets entries of its row.
+    covered_by_indptr, covered_by_indices = coverage["covered_by_indptr"], coverage["covered_by_indices"]
+    positions = covered_by_indptr[:-1, None] + np.arange(num_elite_sets)
+    positions = positions[positions < covered_by_indptr[1:, None]]
+    return np.unique(covered_by_indices[positions])
+
+def mutation(child_solution, elite_sets, mf, mc, mg, t):
+    num_bits_to_mutate = int(number_of_bits_mutated(mf, mc, mg, t))
+    sets_to_mutate = random.sample(sorted(elite_sets), num_bits_to_mutate)
+    for set_id in sets_to_mutate:
+        child_solution[set_id] = 1 - child_solution[set_id]
+    return child_solution
+
+def heuristic_feasibility_operator(points_data, child_solution):
+    solution = child_solution.copy()
+    covered_elements = set()
+    weight_to_ratio = {}
+    uncovered_elements = set()
+    for i, selected in enumerate(child_solution):
+        if selected:
+            covered_elements.update(points_data[i]['points_within_radius'])
+    all_elements = set(point['id'] for point in points_data)
+    uncovered_elements = all_elements - covered_elements
+    for point in points_data:
+        set_id = point['id']
+        set_weight = point['weight']
+        covered_elements = point['points_within_radius']
+        num_uncovered_elements_covered = len(set(covered_elements).intersection(uncovered_elements))
+        if num_uncovered_elements_covered > 0:
+            ratio = set_weight / num_uncovered_elements_covered
+        else:
+            ratio = float('inf')
+        weight_to_ratio[set_id] = ratio
+    sorted_sets = sorted(points_data, key=lambda point: weight_to_ratio[point['id']])
+    for point in sorted_sets:
+        set_id = point['id']
+        covered_elements = set(point['points_within_radius'])
+        common_elements = covered_elements.intersection(uncovered_elements)
+        if common_elements:
+            solution[set_id] = 1
+            uncovered_elements -= common_elements
+        if not uncovered_elements:
+            break
+    element_coverage_count = {element['id']: 0 for element in points_data}
+    for i, selected in enumerate(solution):
+        if selected:
+            covered_elements = points_data[i]['points_within_radius']
+            for covered_element in covered_elements:
+                element_coverage_count[covered_element] += 1
+    sorted_sets = sorted(points_data, key=lambda point: -weight_to_ratio[point['id']])
+    for point in sorted_sets:
+        set_id = point['id']
+        covered_elements = set(point['points_within_radius'])
+        if all(element_coverage_count[element] >= 2 for element in covered_elements):
+            solution[set_id] = 0
+            for covered_element in covered_elements:
+                element_coverage_count[covered_element] -= 1
+    return solution
+
+def heuristic_feasibility_operator_csr(child_solution, weights, coverage):
+    # Same decisions as heuristic_feasibility_operator, driven by coverage
+    # counts over the CSR arrays instead of rebuilt Python sets.
+    indptr, indices = coverage["indptr"], coverage["indices"]
+    num_sets = len(indptr) - 1
+    solution = np.array(child_solution, dtype=np.uint8)
+    element_coverage_count = coverage_counts(coverage, np.flatnonzero(solution), len(solution))
+    uncovered = element_coverage_count == 0
+    uncovered_elements = np.flatnonzero(uncovered)
+    weight_to_ratio = np.full(num_sets, np.inf)
+    if len(uncovered_elements) > 0:
+        candidates, _ = gather_rows(coverage["covered_by_indptr"], coverage["covered_by_indices"], uncovered_elements)
+        num_uncovered_elements_covered = np.bincount(candidates, minlength=num_sets)
+        candidates = np.flatnonzero(num_uncovered_elements_covered)
+        weight_to_ratio[candidates] = weights[candidates] / num_uncovered_elements_covered[candidates]
+        # The ratios are fixed before adding, so the add queue is a single
+        # ordering by (ratio, set id); sets that cover nothing uncovered never add.
+        num_uncovered = len(uncovered_elements)
+        for set_id in candidates[np.argsort(weight_to_ratio[candidates], kind="stable")].tolist():
+            covered_elements = indices[indptr[set_id]:indptr[set_id + 1]]
+            common_elements = covered_elements[uncovered[covered_elements]]
+            if len(common_elements) > 0:
+                solution[set_id] = 1
+                uncovered[common_elements] = False
+                num_uncovered -= len(common_elements)
+                element_coverage_count[covered_elements] += 1
+            if num_uncovered == 0:
+                break
+    # Counts only go down while dropping, so a set whose elements are not all
+    # covered twice now can never be dropped. Like the original operator, every
+    # set that passes the check releases its coverage, selected or not.
+    non_empty = np.flatnonzero(np.diff(indptr) > 0)
+    solution[np.diff(indptr) == 0] = 0
+    droppable = np.zeros(num_sets, dtype=bool)
+    if len(non_empty) > 0:
+        droppable[non_empty] = np.minimum.reduceat(element_coverage_count[indices], indptr[non_empty]) >= 2
+    drop_order = np.argsort(-weight_to_ratio, kind="stable")
+    for set_id in drop_order[droppable[drop_order]].tolist():
+        covered_elements = indices[indptr[set_id]:indptr[set_id + 1]]
+        if element_coverage_count[covered_elements].min() >= 2:
+            solution[set_id] = 0
+            element_coverage_count[covered_elements] -= 1
+    return solution
+
+def is_solution_in_population(solution, population):
+    solution_tuple = tuple(solution)
+    return solution_tuple in population
+
+def replace_solution_above_average_fitness(points_data, population, child_solution):
+    fitness_values = [fitness_function(points_data, solution) for solution in population]
+    average_fitness = sum(fitness_values) / len(fitness_values)
+    above_average_indices = [i for i, fitness in enumerate(fitness_values) if fitness > average_fitness]
+    if above_average_indices:
+        solution_to_replace_index = random.choice(above_average_indices)
+        population[solution_to_replace_index] = child_solution
+    return population
+
+def convert_to_solution_format(points_data, binary_solution):
+    selected_sets = []
+    selected_weights = []
+    for i, selected in enumerate(binary_solution):
+        if selected:
+            selected_sets.append(i)
+            selected_weights.append(points_data[i]['weight'])
+    total_weight = sum(selected_weights)
+    result_dict = {
+        "result": selected_sets,
+        "total_weight": total_weight
+    }
+    return result_dict
+
+def find_best_solution_in_population(points_data, population):
+    best_solution = None
+    best_fitness = float('-inf')
+    for solution in population:
+        fitness = fitness_function(points_data, solution)
+        if fitness > best_fitness:
+            best_fitness = fitness
+            best_solution = solution
+    return best_solution, best_fitness
+
+def check_coverage(points_data, binary_solution):
+    uncovered_elements = set(point['id'] for point in points_data)
+    for i, selected in enumerate(binary_solution):
+        if selected:
+            covered_elements = set(points_data[i]['points_within_radius'])
+            uncovered_elements -= covered_elements
+    return len(uncovered_elements) == 0
+
+def population_matrix(population):
+    return np.array(population, dtype=np.uint8)
+
+def population_fitness(population_matrix, weights):
+    return population_matrix @ weights
+
+def binary_tournament_selection_matrix(fitness_values, rng, num_pairs=1):
+    population_size = len(fitness_values)
+    first = rng.integers(population_size, size=(num_pairs, 2))
+    second = (first + rng.integers(1, population_size, size=(num_pairs, 2))) % population_size
+    return np.where(fitness_values[first] < fitness_values[second], first, second)
+
+def crossover_matrix(parents1, parents2, fitness1, fitness2, rng):
+    probability = np.asarray(fitness2 / (fitness1 + fitness2))[..., None]
+    take_first = rng.random(parents1.shape) < probability
+    return np.where((parents1 == parents2) | take_first, parents1, parents2)
+
+def mutation_matrix(children, elite_sets, num_bits_to_mutate, rng):
+    children = np.atleast_2d(children).copy()
+    num_bits_to_mutate = min(num_bits_to_mutate, len(elite_sets))
+    if num_bits_to_mutate <= 0:
+        return children
+    keys = rng.random((len(children), len(elite_sets)))
+    picks = np.argpartition(keys, num_bits_to_mutate - 1, axis=1)[:, :num_bits_to_mutate]
+    rows = np.arange(len(children))[:, None]
+    children[rows, elite_sets[picks]] ^= 1
+    return children
+
+def init_population_state(population, weights):
+    population = population_matrix(population)
+    fitness_values = population_fitness(population, weights)
+    return {
+        "population": population,
+        "fitness_values": fitness_values,
+        "fitness_total": int(fitness_values.sum()),
+        "members": Counter(solution.tobytes() for solution in population)
+    }
+
+def is_solution_in_population_state(state, solution):
+    return solution.tobytes() in state["members"]
+
+def replace_member(state, index, child_solution, child_fitness):
+    members = state["members"]
+    old_key = state["population"][index].tobytes()
+    members[old_key] -= 1
+    if members[old_key] == 0:
+        del members[old_key]
+    members[child_solution.tobytes()] += 1
+    state["population"][index] = child_solution
+    state["fitness_total"] += int(child_fitness) - int(state["fitness_values"][index])
+    state["fitness_values"][index] = child_fitness
+
+def replace_solution_above_average_fitness_matrix(state, child_solution, child_fitness, rng, reject_duplicates=True):
+    if reject_duplicates and is_solution_in_population_state(state, child_solution):
+        return False
+    fitness_values = state["fitness_values"]
+    # fitness > total / P, kept in integers so the running total stays exact.
+    above_average_indices = np.flatnonzero(fitness_values * len(fitness_values) > state["fitness_total"])
+    if len(above_average_indices) == 0:
+        return False
+    replace_member(state, rng.choice(above_average_indices), child_solution, child_fitness)
+    return True
+
+def lscp_context(weights, indptr, indices, num_elite_sets=5):
+    weights = np.asarray(weights, dtype=np.int64)
+    coverage = coverage_index(indptr, indices, len(weights), weights)
+    return {"weights": weights, "coverage": coverage, "elite_sets": s_elite_indexed(coverage, num_elite_sets)}
+
+def init_lscp_state(context, initialSolutions, rng, start=None):
+    population = generate_initial_population_indexed(initialSolutions, context["coverage"], rng)
+    # Seed solutions (lists of facility ids, e.g. from an earlier run) take the
+    # first slots after going through the feasibility operator.
+    for row, facilities in enumerate((start or [])[:initialSolutions]):
+        chromosome = np.zeros(population.shape[1], dtype=np.uint8)
+        chromosome[np.asarray(facilities, dtype=np.int64)] = 1
+        population[row] = heuristic_feasibility_operator_csr(chromosome, context["weights"], context["coverage"])
+    state = init_population_state(population, context["weights"])
+    state["rng"] = rng
+    state["t"] = 0
+    # With a lower bound the run stops once the best member is within
+    # target_gap of it.
+    state["bound"] = None
+    state["target_gap"] = 0.0
+    state["instrumentation"] = None
+    return state
+
+def resume_lscp_state(saved, context):
+    # Fitness totals and the duplicate index are rebuilt from the population.
+    state = init_population_state(saved["population"], context["weights"])
+    state.update((key, value) for key, value in saved.items() if key not in state)
+    return state
+
+def bound_reached(state):
+    return state["bound"] is not None and within_gap(int(state["fitness_values"].min()), state["bound"], state["target_gap"])
+
+def evolve_lscp(state, context, iterations, mf, mc, mg, reject_duplicates=True):
+    rng = state["rng"]
+    weights, coverage, elite_sets = context["weights"], context["coverage"], context["elite_sets"]
+    population, fitness_values = state["population"], state["fitness_values"]
+    instr = state["instrumentation"]
+    for _ in range(iterations):
+        if bound_reached(state):
+            break
+        t = state["t"]
+        bits_mutated = int(number_of_bits_mutated(mf, mc, mg, t))
+        (parent1, parent2), = run_operator(instr, "selection", binary_tournament_selection_matrix, fitness_values, rng)
+        child_solution = run_operator(instr, "crossover", crossover_matrix, population[parent1], population[parent2], fitness_values[parent1], fitness_values[parent2], rng)
+        child_solution = run_operator(instr, "mutation", mutation_matrix, child_solution, elite_sets, bits_mutated, rng)[0]
+        child_solution = run_operator(instr, "feasibility", heuristic_feasibility_operator_csr, child_solution, weights, coverage)
+        run_operator(instr, "replacement", replace_solution_above_average_fitness_matrix, state, child_solution, child_solution @ weights, rng, reject_duplicates)
+        state["t"] = t + 1
+        if wants_record(instr, t):
+            # Steady state: a generation is one child; the mutation rate is
+            # the number of bits mutated.
+            record_generation(instr, t, fitness_values, matrix_diversity(population), bits_mutated, True)
+    return state
+
+def best_member_indices(state, count):
+    return np.argsort(state["fitness_values"], kind="stable")[:count]
+
+def receive_migrants(state, context, migrants):
+    for migrant in migrants:
+        migrant = np.asarray(migrant, dtype=np.uint8)
+        if is_solution_in_population_state(state, migrant):
+            continue
+        worst = int(np.argmax(state["fitness_values"]))
+        migrant_fitness = migrant @ context["weights"]
+        if migrant_fitness < state["fitness_values"][worst]:
+            replace_member(state, worst, migrant, migrant_fitness)
+    return state
+
+def genetic_algorithm_matrix(instance, initialSolutions, mf, mc, mg, Mutations, seed=None, reject_duplicates=True, start=None, bound=None, target_gap=0.0, instrumentation=None, checkpoint_file=None, checkpoint_interval=100, resume=False):
+    instance = as_instance(instance)
+    context = lscp_context(instance["weight"], instance["indptr"], instance["indices"])
+    # With checkpoint_file the state is saved every checkpoint_interval
+    # iterations; resume continues from it (or starts afresh if there is none
+    # yet). Mutations may be raised on resume to extend a finished run.
+    meta = {"problem": "LSCP", "num_points": len(context["weights"]), "initialSolutions": initialSolutions, "mf": mf, "mc": mc, "mg": mg, "reject_duplicates": reject_duplicates}
+    if checkpoint_file is not None:
+        meta["instance_hash"] = instance_hash(instance["weight"], instance["indptr"], instance["indices"])
+    if resume and checkpoint_file is not None and os.path.exists(checkpoint_file):
+        state = resume_lscp_state(resume_state(checkpoint_file, meta), context)
+    else:
+        state = init_lscp_state(context, initialSolutions, np.random.default_rng(seed), start)
+    state["bound"], state["target_gap"] = bound, target_gap
+    state["instrumentation"] = instrumentation
+    interval = Mutations if checkpoint_file is None else checkpoint_interval
+    while state["t"] < Mutations and not bound_reached(state):
+        evolve_lscp(state, context, min(interval, Mutations - state["t"]), mf, mc, mg, reject_duplicates)
+        if checkpoint_file is not None:
+            save_checkpoint(checkpoint_file, state, meta)
+    return state["population"], state["fitness_values"]
+
+def genetic_algorithm_list(points_data, initialSolutions, mf, mc, mg, Mutations):
+    elite_sets = s_elite(points_data)
+    population = generate_initial_population(points_data, initialSolutions)
+    for t in range(Mutations):
+        parent1, parent2 = binary_tournament_selection(points_data, population)
+        child_solution = form_new_solution_by_crossover(points_data, parent1, parent2)
+        child_solution = mutation(child_solution, elite_sets, mf, mc, mg, t)
+        child_solution = heuristic_feasibility_operator(points_data, child_solution)
+        population = replace_solution_above_average_fitness(points_data, population, child_solution)
+    return population
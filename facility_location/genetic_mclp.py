@@ -0,0 +1,352 @@
+import math
+import random
+import os
+import numpy as np
+from .instance_io import as_instance, is_binary_instance
+from .bounds import within_gap
+from .instrumentation import run_operator, wants_record, record_generation, ids_diversity
+from .checkpoint import save_checkpoint, resume_state, instance_hash
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+def euclidean_distance(point1, point2):
+    return math.sqrt((point1['x'] - point2['x'])**2 + (point1['y'] - point2['y'])**2)
+
+def enrich_data_with_nearest(points_data, percentage):
+    for point in points_data:
+        distances = [
+            {
+                'id': other_point['id'],
+                'distance': euclidean_distance(point, other_point)
+            }
+            for other_point in points_data if other_point['id'] != point['id']
+        ]
+        num_nearest = int(len(distances) * percentage / 100)
+        nearest_points = sorted(distances, key=lambda x: x['distance'])[:num_nearest]
+        point['nearest_points'] = [item['id'] for item in nearest_points]
+    return points_data
+
+def num_nearest_neighbours(num_points, percentage):
+    return int((num_points - 1) * percentage / 100)
+
+def nearest_neighbour_matrix(x, y, k, chunk_size=None):
+    # (n, k) array of the k nearest other points of every point, ordered by
+    # (distance, id) like enrich_data_with_nearest.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if k <= 0:
+        return np.zeros((n, 0), dtype=np.int64)
+    rows = np.arange(n)
+    if cKDTree is not None:
+        distances, neighbours = cKDTree(np.column_stack([x, y])).query(np.column_stack([x, y]), k=k + 1)
+        keep = np.argsort(neighbours == rows[:, None], axis=1, kind="stable")[:, :k]
+        neighbours = np.take_along_axis(neighbours, keep, axis=1)
+        distances = np.take_along_axis(distances, keep, axis=1)
+    else:
+        chunk_size = chunk_size or max(1, 10000000 // n)
+        neighbours = np.empty((n, k), dtype=np.int64)
+        distances = np.empty((n, k))
+        for start in range(0, n, chunk_size):
+            chunk = rows[start:start + chunk_size]
+            chunk_distances = np.sqrt((x[chunk, None] - x[None, :])**2 + (y[chunk, None] - y[None, :])**2)
+            chunk_distances[np.arange(len(chunk)), chunk] = np.inf
+            nearest = np.argpartition(chunk_distances, k - 1, axis=1)[:, :k]
+            neighbours[chunk] = nearest
+            distances[chunk] = np.take_along_axis(chunk_distances, nearest, axis=1)
+    order = np.lexsort((neighbours, distances), axis=1)
+    return np.take_along_axis(neighbours, order, axis=1).astype(np.int64)
+
+def nearest_cache_path(instance_file, k):
+    if is_binary_instance(instance_file):
+        return os.path.join(instance_file, f"nearest_{k}.npy")
+    return f"{os.path.splitext(instance_file)[0]}.nearest_{k}.npy"
+
+def coordinate_files(instance_file):
+    # The files the coordinates are read from; a directory's own mtime does
+    # not change when the arrays in it are overwritten.
+    if is_binary_instance(instance_file):
+        return [os.path.join(instance_file, "x.npy"), os.path.join(instance_file, "y.npy")]
+    return [instance_file]
+
+def load_nearest_neighbour_matrix(instance_file, x, y, percentage):
+    k = num_nearest_neighbours(len(x), percentage)
+    cache_file = nearest_cache_path(instance_file, k)
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= max(os.path.getmtime(path) for path in coordinate_files(instance_file)):
+        nearest = np.load(cache_file, mmap_mode="r")
+        if nearest.shape == (len(x), k):
+            return nearest
+    nearest = nearest_neighbour_matrix(x, y, k)
+    temporary_file = f"{cache_file[:-len('.npy')]}.{os.getpid()}.tmp.npy"
+    np.save(temporary_file, nearest)
+    os.replace(temporary_file, cache_file)
+    return nearest
+
+def fitness(solution):
+    all_points_within_radius = [pt['points_within_radius'] for pt in solution]
+    unique_points_within_radius = set(item for sublist in all_points_within_radius for item in sublist)
+    return len(unique_points_within_radius)
+
+def generate_population(points_data, n, k):
+    return [random.sample(points_data, k) for _ in range(n)]
+
+def binary_tournament_selection(population):
+    selected_solutions = []
+
+    while len(selected_solutions) < len(population):
+        solution1, solution2 = random.sample(population, 2)
+        fitness1 = fitness(solution1)
+        fitness2 = fitness(solution2)
+        if fitness1 > fitness2:
+            selected_solutions.append(solution1)
+        else:
+            selected_solutions.append(solution2)
+
+    return selected_solutions
+
+def single_point_crossover(population, crossover_rate):
+    offspring_population = []
+
+    while len(offspring_population) < len(population):
+        parent1, parent2 = random.sample(population, 2)
+        if random.random() < crossover_rate:
+            crossover_point = random.randint(1, len(parent1) - 1)
+            offspring1 = parent1[:crossover_point] + parent2[crossover_point:]
+            offspring2 = parent2[:crossover_point] + parent1[crossover_point:]
+            offspring_population.append(offspring1)
+            if len(offspring_population) < len(population):
+                offspring_population.append(offspring2)
+
+    return offspring_population
+
+def mutate_solution(points_data, solution, mutation_rate):
+    mutated_solution = solution.copy()
+    
+    for i, point in enumerate(mutated_solution):
+        if random.random() < mutation_rate:
+            random_nearest = random.choice(point['nearest_points'])
+            nearest_point_data = next(p for p in points_data if p['id'] == random_nearest)
+            mutated_solution[i] = nearest_point_data
+            
+    return mutated_solution
+
+def mutate_population(points_data, population, mutation_rate):
+    return [mutate_solution(points_data, solution, mutation_rate) for solution in population]
+
+def select_best_solutions(population1, population2):
+    combined_population = population1 + population2
+    sorted_population = sorted(combined_population, key=fitness, reverse=True)
+    return sorted_population[:len(population1)]
+
+def coverage_bitset(context, facility):
+    # Bitsets are built on first use, so only facilities that ever enter a
+    # solution pay the n-bit memory cost.
+    bitsets = context["bitsets"]
+    if bitsets[facility] is None:
+        indptr, indices = context["indptr"], context["indices"]
+        bits = np.zeros(len(bitsets), dtype=bool)
+        bits[indices[indptr[facility]:indptr[facility + 1]]] = True
+        bitsets[facility] = int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+    return bitsets[facility]
+
+def bitset_context(indptr, indices, nearest, max_cache_size=1000000):
+    return {
+        "indptr": np.asarray(indptr),
+        "indices": np.asarray(indices),
+        "bitsets": [None] * (len(indptr) - 1),
+        "nearest": nearest,
+        "cache": {},
+        "max_cache_size": max_cache_size
+    }
+
+def bitset_fitness(solution, context):
+    key = tuple(sorted(solution.tolist()))
+    cache = context["cache"]
+    if key not in cache:
+        if len(cache) >= context["max_cache_size"]:
+            cache.clear()
+        covered = 0
+        for facility in key:
+            covered |= coverage_bitset(context, facility)
+        cache[key] = covered.bit_count()
+    return cache[key]
+
+def population_fitness_bitset(population, context):
+    return np.array([bitset_fitness(solution, context) for solution in population], dtype=np.int64)
+
+def generate_population_ids(n, k, num_points, rng):
+    return np.array([rng.choice(num_points, k, replace=False) for _ in range(n)], dtype=np.int64)
+
+def binary_tournament_selection_ids(population, fitness_values, rng):
+    population_size = len(population)
+    first = rng.integers(population_size, size=population_size)
+    second = (first + rng.integers(1, population_size, size=population_size)) % population_size
+    return population[np.where(fitness_values[first] > fitness_values[second], first, second)]
+
+def mutate_population_ids(population, nearest, mutation_rate, rng):
+    mutated_population = population.copy()
+    if nearest.shape[1] == 0:
+        return mutated_population
+    mask = rng.random(population.shape) < mutation_rate
+    choices = rng.integers(nearest.shape[1], size=population.shape)
+    mutated_population[mask] = nearest[population[mask], choices[mask]]
+    return mutated_population
+
+def single_point_crossover_ids(population, crossover_rate, rng):
+    # Like single_point_crossover, pairs that do not cross over produce no
+    # offspring, so every pair drawn here crosses. Without crossover the
+    # original never fills the offspring population; the parents are kept.
+    population_size, k = population.shape
+    if crossover_rate <= 0 or k == 1:
+        return population.copy()
+    parents1 = rng.integers(population_size, size=(population_size + 1) // 2)
+    parents2 = (parents1 + rng.integers(1, population_size, size=len(parents1))) % population_size
+    crossover_points = rng.integers(1, k, size=len(parents1))
+    head = np.arange(k) < crossover_points[:, None]
+    offspring1 = np.where(head, population[parents1], population[parents2])
+    offspring2 = np.where(head, population[parents2], population[parents1])
+    return np.stack([offspring1, offspring2], axis=1).reshape(-1, k)[:population_size]
+
+def select_best_solutions_ids(population1, fitness1, population2, fitness2):
+    combined_population = np.concatenate([population1, population2])
+    combined_fitness = np.concatenate([fitness1, fitness2])
+    best = np.argsort(-combined_fitness, kind="stable")[:len(population1)]
+    return combined_population[best], combined_fitness[best]
+
+def init_mclp_state(context, initial_solutions, k, mutation_rate_initial, rng, start=None):
+    population = generate_population_ids(initial_solutions, k, len(context["bitsets"]), rng)
+    # Seed solutions take the first slots; short ones keep their random tail.
+    for row, facilities in enumerate((start or [])[:initial_solutions]):
+        facilities = np.asarray(facilities, dtype=np.int64)[:k]
+        population[row, :len(facilities)] = facilities
+    fitness_values = population_fitness_bitset(population, context)
+    return {
+        "population": population,
+        "fitness_values": fitness_values,
+        "previous_best_fitness": int(fitness_values.max()),
+        "mutation_rate": mutation_rate_initial,
+        "stagnant_counter": 0,
+        "loop_counter": 0,
+        "change_mutation_counter": 0,
+        "done": False,
+        "rng": rng,
+        # With an upper bound the run also stops once the best member is
+        # within target_gap of it.
+        "bound": None,
+        "target_gap": 0.0,
+        "instrumentation": None
+    }
+
+def bound_reached_mclp(state):
+    return state["bound"] is not None and within_gap(int(state["fitness_values"].max()), state["bound"], state["target_gap"])
+
+def evolve_mclp(state, context, generations, crossover_rate, mutation_rate_final):
+    rng = state["rng"]
+    instr = state["instrumentation"]
+    for _ in range(generations):
+        if state["done"] or bound_reached_mclp(state):
+            state["done"] = True
+            break
+        selected_population = run_operator(instr, "selection", binary_tournament_selection_ids, state["population"], state["fitness_values"], rng)
+        mutated_population = run_operator(instr, "mutation", mutate_population_ids, selected_population, context["nearest"], state["mutation_rate"], rng)
+        new_temp_population = run_operator(instr, "crossover", single_point_crossover_ids, mutated_population, crossover_rate, rng)
+        new_temp_fitness = run_operator(instr, "fitness", population_fitness_bitset, new_temp_population, context)
+        state["population"], state["fitness_values"] = run_operator(instr, "replacement", select_best_solutions_ids, new_temp_population, new_temp_fitness, state["population"], state["fitness_values"])
+        if wants_record(instr, state["loop_counter"]):
+            record_generation(instr, state["loop_counter"], state["fitness_values"], ids_diversity(state["population"], len(context["bitsets"])), state["mutation_rate"], False)
+
+        best_solution_fitness = int(state["fitness_values"][0])
+
+        if best_solution_fitness == state["previous_best_fitness"]:
+            state["stagnant_counter"] += 1
+        else:
+            state["stagnant_counter"] = 0
+
+        if state["change_mutation_counter"] == 0 and state["stagnant_counter"] == 50:
+            state["stagnant_counter"] = 0
+            state["mutation_rate"] = mutation_rate_final
+            state["change_mutation_counter"] += 1
+
+        if state["change_mutation_counter"] >= 1 and state["stagnant_counter"] == 100:
+            state["done"] = True
+            break
+
+        state["previous_best_fitness"] = best_solution_fitness
+        state["loop_counter"] += 1
+    return state
+
+def best_member_indices_mclp(state, count):
+    return np.argsort(-state["fitness_values"], kind="stable")[:count]
+
+def receive_migrants_mclp(state, context, migrants):
+    migrants = np.asarray(migrants, dtype=np.int64).reshape(-1, state["population"].shape[1])
+    state["population"], state["fitness_values"] = select_best_solutions_ids(state["population"], state["fitness_values"], migrants, population_fitness_bitset(migrants, context))
+    return state
+
+def genetic_algorithm_bitset(instance, nearest, initial_solutions, k, crossover_rate, mutation_rate_initial, mutation_rate_final, seed=None, start=None, bound=None, target_gap=0.0, instrumentation=None, checkpoint_file=None, checkpoint_interval=100, resume=False):
+    instance = as_instance(instance)
+    context = bitset_context(instance["indptr"], instance["indices"], nearest)
+    # With checkpoint_file the state is saved every checkpoint_interval
+    # generations; resume continues from it (or starts afresh if there is none yet).
+    meta = {
+        "problem": "MCLP",
+        "num_points": len(context["bitsets"]),
+        "num_nearest": int(nearest.shape[1]),
+        "initial_solutions": initial_solutions,
+        "k": k,
+        "crossover_rate": crossover_rate,
+        "mutation_rate_initial": mutation_rate_initial,
+        "mutation_rate_final": mutation_rate_final
+    }
+    if checkpoint_file is not None:
+        meta["instance_hash"] = instance_hash(instance["weight"], instance["indptr"], instance["indices"], nearest)
+    if resume and checkpoint_file is not None and os.path.exists(checkpoint_file):
+        state = resume_state(checkpoint_file, meta)
+    else:
+        state = init_mclp_state(context, initial_solutions, k, mutation_rate_initial, np.random.default_rng(seed), start)
+    state["bound"], state["target_gap"] = bound, target_gap
+    state["instrumentation"] = instrumentation
+    while not state["done"]:
+        evolve_mclp(state, context, 100 if checkpoint_file is None else checkpoint_interval, crossover_rate, mutation_rate_final)
+        if checkpoint_file is not None:
+            save_checkpoint(checkpoint_file, state, meta)
+    best = int(np.argmax(state["fitness_values"]))
+    return state["population"][best], int(state["fitness_values"][best]), state["loop_counter"]
+
+def genetic_algorithm_list(points_data, initial_solutions, k, crossover_rate, mutation_rate_initial, mutation_rate_final, percentage_nearest_neighbours):
+    enrich_data_with_nearest(points_data, percentage_nearest_neighbours)
+    population = generate_population(points_data, initial_solutions, k)
+    previous_best_fitness = fitness(max(population, key=fitness))
+    mutation_rate = mutation_rate_initial
+    stagnant_counter = 0
+    loop_counter = 0
+    change_mutation_counter = 0
+
+    while True:
+        selected_population = binary_tournament_selection(population)
+        mutated_population = mutate_population(points_data, selected_population, mutation_rate)
+        new_temp_population = single_point_crossover(mutated_population, crossover_rate)
+        population = select_best_solutions(new_temp_population, population)
+
+        best_solution_fitness = fitness(max(population, key=fitness))
+
+        if best_solution_fitness == previous_best_fitness:
+            stagnant_counter += 1
+        else:
+            stagnant_counter = 0
+
+        if change_mutation_counter == 0 and stagnant_counter == 50:
+            stagnant_counter = 0
+            mutation_rate = mutation_rate_final
+            change_mutation_counter += 1
+
+        if change_mutation_counter >= 1 and stagnant_counter == 100:
+            break
+
+        previous_best_fitness = best_solution_fitness
+        loop_counter += 1
+
+    best_solution = max(population, key=fitness)
+    return best_solution, fitness(best_solution), loop_counter
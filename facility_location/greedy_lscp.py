@@ -0,0 +1,73 @@
+import heapq
+from .instance_io import as_instance
+from .coverage import covered_by_index
+
+def greedy_set_covering(points_data):
+    selected_facilities = []
+    uncovered_points = set(point["id"] for point in points_data)
+
+    while len(uncovered_points) > 0:
+        best_facility = None
+        best_weight_per_coverage = float("inf")
+
+        for facility in points_data:
+            covered_points = set(facility["points_within_radius"]).intersection(uncovered_points)
+            num_covered_points = len(covered_points)
+            
+            if num_covered_points == 0:
+                continue
+
+            weight_per_coverage = facility["weight"] / num_covered_points
+
+            if weight_per_coverage < best_weight_per_coverage:
+                best_facility = facility
+                best_weight_per_coverage = weight_per_coverage
+                
+
+        if best_facility:
+            selected_facilities.append(best_facility['id'])
+            uncovered_points -= set(best_facility["points_within_radius"])
+
+    total_weight = sum(point["weight"] for point in points_data if point["id"] in selected_facilities)
+
+    return {"result": selected_facilities, "total_weight": total_weight}
+
+def lazy_greedy_set_covering(instance):
+    instance = as_instance(instance)
+    indptr, indices = instance["indptr"], instance["indices"]
+    n = len(indptr) - 1
+    covered_by_indptr, covered_by_indices = covered_by_index(indptr, indices, n)
+    indptr, indices = indptr.tolist(), indices.tolist()
+    covered_by_indptr, covered_by_indices = covered_by_indptr.tolist(), covered_by_indices.tolist()
+    weights = instance["weight"].tolist()
+
+    uncovered_count = [indptr[i + 1] - indptr[i] for i in range(n)]
+    covered = [False] * n
+    num_uncovered = n
+    # Entries are (weight per newly covered point, facility, count it was scored with).
+    # Counts only shrink, so a stale entry is a lower bound and the first entry
+    # popped with an up-to-date count is the facility the full scan would pick.
+    heap = [(weights[i] / uncovered_count[i], i, uncovered_count[i]) for i in range(n) if uncovered_count[i] > 0]
+    heapq.heapify(heap)
+
+    selected_facilities = []
+    while num_uncovered > 0 and heap:
+        _, facility, count = heapq.heappop(heap)
+        current_count = uncovered_count[facility]
+        if count != current_count:
+            if current_count > 0:
+                heapq.heappush(heap, (weights[facility] / current_count, facility, current_count))
+            continue
+
+        selected_facilities.append(facility)
+        for element in indices[indptr[facility]:indptr[facility + 1]]:
+            if covered[element]:
+                continue
+            covered[element] = True
+            num_uncovered -= 1
+            for other in covered_by_indices[covered_by_indptr[element]:covered_by_indptr[element + 1]]:
+                uncovered_count[other] -= 1
+
+    total_weight = sum(weights[facility] for facility in selected_facilities)
+
+    return {"result": selected_facilities, "total_weight": total_weight}
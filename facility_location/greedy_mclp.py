@@ -0,0 +1,66 @@
+import numpy as np
+from .instance_io import as_instance
+from .coverage import covered_by_index, gather_rows
+
+def greedy_set_covering(points_data, maximumFacilities):
+    selected_facilities = []
+    uncovered_points = set(point["id"] for point in points_data)
+
+    while len(uncovered_points) > 0 and len(selected_facilities) < maximumFacilities:
+        best_facility = None
+        best_weight_per_coverage = float("inf")
+
+        for facility in points_data:
+            covered_points = set(facility["points_within_radius"]).intersection(uncovered_points)
+            num_covered_points = len(covered_points)
+            
+            if num_covered_points == 0:
+                continue
+
+            weight_per_coverage = 1 / num_covered_points
+
+            if weight_per_coverage < best_weight_per_coverage:
+                best_facility = facility
+                best_weight_per_coverage = weight_per_coverage
+                
+
+        if best_facility:
+            selected_facilities.append(best_facility['id'])
+            uncovered_points -= set(best_facility["points_within_radius"])
+    
+    total_points_covered=len(set(point["id"] for point in points_data)-uncovered_points)
+
+    return {"result": selected_facilities, "total_points_covered": total_points_covered}
+
+def incremental_greedy_set_covering(instance, maximumFacilities, weighted=False):
+    instance = as_instance(instance)
+    indptr, indices = instance["indptr"], instance["indices"]
+    n = len(indptr) - 1
+    covered_by_indptr, covered_by_indices = covered_by_index(indptr, indices, n)
+    if weighted:
+        demand = np.asarray(instance["weight"], dtype=np.int64)
+    else:
+        demand = np.ones(n, dtype=np.int64)
+
+    # gain[f] is the demand facility f would newly cover if it were picked next.
+    facility_of_entry = np.repeat(np.arange(n), np.diff(indptr))
+    gain = np.bincount(facility_of_entry, weights=demand[indices], minlength=n).astype(np.int64)
+    covered = np.zeros(n, dtype=bool)
+
+    selected_facilities = []
+    while len(selected_facilities) < maximumFacilities:
+        facility = int(np.argmax(gain))
+        if gain[facility] <= 0:
+            break
+        selected_facilities.append(facility)
+
+        elements = indices[indptr[facility]:indptr[facility + 1]]
+        newly_covered = elements[~covered[elements]]
+        covered[newly_covered] = True
+        affected, lengths = gather_rows(covered_by_indptr, covered_by_indices, newly_covered)
+        gain -= np.bincount(affected, weights=np.repeat(demand[newly_covered], lengths), minlength=n).astype(np.int64)
+
+    result = {"result": selected_facilities, "total_points_covered": int(covered.sum())}
+    if weighted:
+        result["total_weight_covered"] = int(demand[covered].sum())
+    return result
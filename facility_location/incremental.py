@@ -0,0 +1,159 @@
+import itertools
+import math
+import numpy as np
+from .instance_io import as_instance, index_dtype
+from .generator import pair_distances, grid_cell_size
+from .coverage import coverage_index
+from .genetic_lscp import heuristic_feasibility_operator_csr
+from .local_search import local_search_mclp, local_search_lscp, LOCAL_SEARCH_TIME
+
+# A dynamic instance keeps points under stable ids in dicts, so inserting,
+# moving or deleting a point only touches the grid cells around it and the
+# points_within_radius sets of its neighbours. export_instance compacts it back
+# into an array instance whose ids are positions again.
+
+def cell_of(dynamic, x, y):
+    return math.floor(x / dynamic["cell_size"]), math.floor(y / dynamic["cell_size"])
+
+def nearby_points(dynamic, x, y):
+    cx, cy = cell_of(dynamic, x, y)
+    candidates = [other for dx in (-1, 0, 1) for dy in (-1, 0, 1) for other in dynamic["grid"].get((cx + dx, cy + dy), ())]
+    other_x = np.fromiter((dynamic["points"][other][0] for other in candidates), dtype=float, count=len(candidates))
+    other_y = np.fromiter((dynamic["points"][other][1] for other in candidates), dtype=float, count=len(candidates))
+    within = pair_distances(x, y, other_x, other_y) <= dynamic["radius"]
+    return [other for other, near in zip(candidates, within.tolist()) if near]
+
+def dynamic_instance(instance):
+    instance = as_instance(instance)
+    radius = instance["radius"]
+    indptr, indices = instance["indptr"].tolist(), instance["indices"].tolist()
+    dynamic = {
+        "radius": radius,
+        "maximumFacilities": instance["maximumFacilities"],
+        "cell_size": grid_cell_size(radius),
+        "points": {},
+        "neighbours": {},
+        "grid": {},
+        "next_id": len(indptr) - 1
+    }
+    for i, (x, y, weight) in enumerate(zip(instance["x"].tolist(), instance["y"].tolist(), instance["weight"].tolist())):
+        dynamic["points"][i] = (x, y, weight)
+        dynamic["neighbours"][i] = set(indices[indptr[i]:indptr[i + 1]])
+        dynamic["grid"].setdefault(cell_of(dynamic, x, y), set()).add(i)
+    return dynamic
+
+def place_point(dynamic, point_id, x, y, weight):
+    dynamic["points"][point_id] = (x, y, weight)
+    dynamic["grid"].setdefault(cell_of(dynamic, x, y), set()).add(point_id)
+    nearby = nearby_points(dynamic, x, y)
+    dynamic["neighbours"][point_id] = set(nearby)
+    for other in nearby:
+        dynamic["neighbours"][other].add(point_id)
+    return nearby
+
+def unplace_point(dynamic, point_id):
+    x, y, weight = dynamic["points"].pop(point_id)
+    cell = cell_of(dynamic, x, y)
+    dynamic["grid"][cell].discard(point_id)
+    if not dynamic["grid"][cell]:
+        del dynamic["grid"][cell]
+    nearby = dynamic["neighbours"].pop(point_id)
+    for other in nearby:
+        if other != point_id:
+            dynamic["neighbours"][other].discard(point_id)
+    return weight, nearby
+
+def insert_point(dynamic, x, y, weight):
+    point_id = dynamic["next_id"]
+    dynamic["next_id"] += 1
+    place_point(dynamic, point_id, float(x), float(y), int(weight))
+    return point_id
+
+def move_point(dynamic, point_id, x, y, weight=None):
+    old_weight, old_nearby = unplace_point(dynamic, point_id)
+    new_nearby = place_point(dynamic, point_id, float(x), float(y), old_weight if weight is None else int(weight))
+    return old_nearby.union(new_nearby)
+
+def delete_point(dynamic, point_id):
+    _, nearby = unplace_point(dynamic, point_id)
+    return nearby - {point_id}
+
+def apply_changes(dynamic, changes):
+    # changes: [{"op": "insert", "x", "y", "weight"}, {"op": "move", "id", "x",
+    # "y"[, "weight"]}, {"op": "delete", "id"}]. Returns the ids whose
+    # points_within_radius changed.
+    affected = set()
+    for change in changes:
+        if change["op"] == "insert":
+            point_id = insert_point(dynamic, change["x"], change["y"], change["weight"])
+            affected.update(dynamic["neighbours"][point_id])
+        elif change["op"] == "move":
+            affected.update(move_point(dynamic, change["id"], change["x"], change["y"], change.get("weight")))
+        elif change["op"] == "delete":
+            affected.update(delete_point(dynamic, change["id"]))
+            affected.discard(change["id"])
+        else:
+            raise ValueError(f"Unknown change: {change['op']}")
+    return affected.intersection(dynamic["points"])
+
+def export_instance(dynamic):
+    ids = sorted(dynamic["points"])
+    n = len(ids)
+    position = np.full(dynamic["next_id"], -1, dtype=np.int64)
+    position[ids] = np.arange(n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(dynamic["neighbours"][point_id]) for point_id in ids], out=indptr[1:])
+    # Ids keep their order when compacted, so sorting the stable ids sorts the rows.
+    neighbours = np.fromiter(itertools.chain.from_iterable(sorted(dynamic["neighbours"][point_id]) for point_id in ids), dtype=np.int64, count=int(indptr[-1]))
+    indices = position[neighbours].astype(index_dtype(n))
+    instance = {
+        "radius": dynamic["radius"],
+        "maximumFacilities": dynamic["maximumFacilities"],
+        "total_points": n,
+        "x": np.array([dynamic["points"][point_id][0] for point_id in ids], dtype=float),
+        "y": np.array([dynamic["points"][point_id][1] for point_id in ids], dtype=float),
+        "weight": np.array([dynamic["points"][point_id][2] for point_id in ids], dtype=np.int64),
+        "indptr": indptr,
+        "indices": indices
+    }
+    return instance, ids
+
+def reoptimize_lscp(dynamic, facilities, time_limit=LOCAL_SEARCH_TIME, exported=None):
+    # Repair: keep the surviving facilities and cover what is left uncovered
+    # with the CSR feasibility operator of the genetic algorithm, which also
+    # drops facilities that became redundant. Improvement: the add-and-drop
+    # search of local_search.py on the compacted instance.
+    instance, ids = export_instance(dynamic) if exported is None else exported
+    position = {point_id: i for i, point_id in enumerate(ids)}
+    weights = instance["weight"]
+    solution = np.zeros(len(ids), dtype=np.uint8)
+    solution[[position[facility] for facility in facilities if facility in position]] = 1
+    coverage = coverage_index(instance["indptr"], instance["indices"], len(ids), weights)
+    solution = heuristic_feasibility_operator_csr(solution, weights, coverage)
+    search = local_search_lscp(instance, np.flatnonzero(solution), time_limit)
+    return {"result": [ids[facility] for facility in search["result"]], "total_weight": search["total_weight"]}
+
+def reoptimize_mclp(dynamic, facilities, maximumFacilities=None, weighted=False, time_limit=LOCAL_SEARCH_TIME, exported=None):
+    # Repair: keep the surviving facilities, dropping the least useful ones if
+    # there are too many. Improvement: the swap search of local_search.py on
+    # the compacted instance, which also fills free slots greedily. exported
+    # is export_instance(dynamic) if the caller already has it.
+    if maximumFacilities is None:
+        maximumFacilities = dynamic["maximumFacilities"]
+    instance, ids = export_instance(dynamic) if exported is None else exported
+    position = {point_id: i for i, point_id in enumerate(ids)}
+    selected = [position[facility] for facility in dict.fromkeys(facilities) if facility in position]
+    demand = instance["weight"] if weighted else np.ones(len(ids), dtype=np.int64)
+    indptr, indices = instance["indptr"], instance["indices"]
+    while len(selected) > maximumFacilities:
+        rows = [indices[indptr[facility]:indptr[facility + 1]] for facility in selected]
+        count = np.zeros(len(ids), dtype=np.int64)
+        for elements in rows:
+            count[elements] += 1
+        losses = [demand[elements][count[elements] == 1].sum() for elements in rows]
+        selected.pop(min(range(len(selected)), key=lambda i: (losses[i], -selected[i])))
+    search = local_search_mclp(instance, selected, maximumFacilities, weighted, time_limit)
+    return {
+        "result": [ids[facility] for facility in search["result"]],
+        "total_points_covered": search["total_weight_covered"] if weighted else search["total_points_covered"]
+    }
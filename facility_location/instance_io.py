@@ -0,0 +1,103 @@
+import json
+import os
+import numpy as np
+
+ARRAY_FIELDS = ("x", "y", "weight", "indptr", "indices")
+META_FIELDS = ("radius", "maximumFacilities", "total_points")
+INSTANCE_FILE = "population_points.json"
+INSTANCE_DIRECTORY = "population_points_bin"
+
+def index_dtype(n):
+    return np.int32 if n < 2**31 else np.int64
+
+def coverage_arrays(points_data):
+    n = len(points_data)
+    lengths = np.fromiter((len(point["points_within_radius"]) for point in points_data), dtype=np.int64, count=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.fromiter((i for point in points_data for i in point["points_within_radius"]), dtype=index_dtype(n), count=int(indptr[-1]))
+    return indptr, indices
+
+def points_data_to_arrays(data):
+    points_data = data["points_data"]
+    indptr, indices = coverage_arrays(points_data)
+    instance = {field: data[field] for field in META_FIELDS}
+    instance["x"] = np.array([point["x"] for point in points_data], dtype=float)
+    instance["y"] = np.array([point["y"] for point in points_data], dtype=float)
+    instance["weight"] = np.array([point["weight"] for point in points_data], dtype=np.int64)
+    instance["indptr"] = indptr
+    instance["indices"] = indices
+    return instance
+
+def arrays_to_points_data(instance):
+    indptr = np.asarray(instance["indptr"])
+    indices = np.asarray(instance["indices"])
+    data = {field: instance[field] for field in META_FIELDS}
+    data["points_data"] = [
+        {
+            "id": i,
+            "x": float(x),
+            "y": float(y),
+            "weight": int(weight),
+            "points_within_radius": indices[indptr[i]:indptr[i + 1]].tolist()
+        }
+        for i, (x, y, weight) in enumerate(zip(instance["x"], instance["y"], instance["weight"]))
+    ]
+    return data
+
+def as_instance(instance):
+    # Solvers work on array instances; paths, JSON-style dicts and bare
+    # points_data lists are converted on the way in.
+    if isinstance(instance, str):
+        return load_instance(instance)
+    if isinstance(instance, dict) and "indptr" in instance:
+        return instance
+    if isinstance(instance, dict):
+        return points_data_to_arrays(instance)
+    return points_data_to_arrays({"radius": None, "maximumFacilities": None, "total_points": len(instance), "points_data": instance})
+
+def save_binary_instance(directory, instance):
+    os.makedirs(directory, exist_ok=True)
+    for field in ARRAY_FIELDS:
+        np.save(os.path.join(directory, field + ".npy"), np.asarray(instance[field]))
+    with open(os.path.join(directory, "meta.json"), "w") as file:
+        json.dump({field: instance[field] for field in META_FIELDS}, file, indent=2)
+
+def load_binary_instance(directory, mmap_mode="r"):
+    with open(os.path.join(directory, "meta.json"), "r") as file:
+        instance = json.load(file)
+    for field in ARRAY_FIELDS:
+        instance[field] = np.load(os.path.join(directory, field + ".npy"), mmap_mode=mmap_mode)
+    return instance
+
+def is_binary_instance(path):
+    return os.path.isdir(path)
+
+def default_instance_path():
+    # create_problem.py always writes the binary directory but the JSON file
+    # only below its streaming threshold; whichever was written last is the
+    # current instance (meta.json is written after the arrays).
+    meta_file = os.path.join(INSTANCE_DIRECTORY, "meta.json")
+    if os.path.exists(meta_file) and (not os.path.exists(INSTANCE_FILE) or os.path.getmtime(meta_file) >= os.path.getmtime(INSTANCE_FILE)):
+        return INSTANCE_DIRECTORY
+    return INSTANCE_FILE
+
+def load_instance(path, mmap_mode="r"):
+    if is_binary_instance(path):
+        return load_binary_instance(path, mmap_mode)
+    with open(path, "r") as file:
+        return points_data_to_arrays(json.load(file))
+
+def load_points_data(path):
+    if is_binary_instance(path):
+        return arrays_to_points_data(load_binary_instance(path))
+    with open(path, "r") as file:
+        return json.load(file)
+
+def json_to_binary(json_file, directory):
+    with open(json_file, "r") as file:
+        save_binary_instance(directory, points_data_to_arrays(json.load(file)))
+
+def binary_to_json(directory, json_file):
+    with open(json_file, "w") as file:
+        json.dump(arrays_to_points_data(load_binary_instance(directory)), file, indent=2)
@@ -0,0 +1,87 @@
+import json
+import time
+import numpy as np
+
+# Optional instrumentation for the genetic loops. The loops take None (no
+# overhead beyond one check per operator) or the dict built here, which
+# collects cumulative time and call counts per operator, streams one JSON line
+# per traced generation and calls hooks.
+#
+# A hook is a dict with any of these callables:
+#   "before": f(operator_name)            right before an operator runs
+#   "after": f(operator_name, seconds)    right after it returns
+#   "generation": f(record)               with every traced generation record
+
+def instrumentation(trace_file=None, hooks=None, trace_interval=1):
+    return {
+        "operators": {},
+        "hooks": list(hooks or []),
+        "trace": open(trace_file, "w") if trace_file is not None else None,
+        "trace_interval": trace_interval,
+        "start_time": time.perf_counter()
+    }
+
+def run_operator(instr, name, operator, *args):
+    if instr is None:
+        return operator(*args)
+    for hook in instr["hooks"]:
+        if "before" in hook:
+            hook["before"](name)
+    start_time = time.perf_counter()
+    result = operator(*args)
+    seconds = time.perf_counter() - start_time
+    totals = instr["operators"].setdefault(name, {"seconds": 0.0, "calls": 0})
+    totals["seconds"] += seconds
+    totals["calls"] += 1
+    for hook in instr["hooks"]:
+        if "after" in hook:
+            hook["after"](name, seconds)
+    return result
+
+def wants_record(instr, generation):
+    return instr is not None and (instr["trace"] is not None or any("generation" in hook for hook in instr["hooks"])) and generation % instr["trace_interval"] == 0
+
+def record_generation(instr, generation, fitness_values, diversity, mutation_rate, minimize):
+    record = {
+        "generation": generation,
+        "elapsed": time.perf_counter() - instr["start_time"],
+        "best": float(fitness_values.min() if minimize else fitness_values.max()),
+        "mean": float(fitness_values.mean()),
+        "diversity": diversity,
+        "mutation_rate": mutation_rate
+    }
+    if instr["trace"] is not None:
+        instr["trace"].write(json.dumps(record) + "\n")
+    for hook in instr["hooks"]:
+        if "generation" in hook:
+            hook["generation"](record)
+    return record
+
+def selection_diversity(counts, population_size):
+    # Mean pairwise Hamming distance between the selection vectors, from how
+    # many members select each facility.
+    if population_size < 2:
+        return 0.0
+    counts = np.asarray(counts, dtype=float)
+    return float((counts * (population_size - counts)).sum() / (population_size * (population_size - 1) / 2))
+
+def matrix_diversity(population):
+    return selection_diversity(population.sum(axis=0, dtype=np.int64), len(population))
+
+def ids_diversity(population, num_points):
+    population = np.sort(population, axis=1)
+    # Ids repeated within one member only count once.
+    first = np.ones(population.shape, dtype=bool)
+    first[:, 1:] = population[:, 1:] != population[:, :-1]
+    return selection_diversity(np.bincount(population[first], minlength=num_points), len(population))
+
+def summary(instr):
+    if instr["trace"] is not None:
+        instr["trace"].close()
+        instr["trace"] = None
+    return {name: dict(totals) for name, totals in sorted(instr["operators"].items(), key=lambda item: -item[1]["seconds"])}
+
+def print_summary(profile):
+    total = sum(totals["seconds"] for totals in profile.values()) or 1.0
+    for name, totals in profile.items():
+        print(f"{name:<14} {totals['seconds']:10.4f} s {100 * totals['seconds'] / total:6.1f} % {totals['calls']:10d} calls")
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import threading
+import multiprocessing as mp
+import numpy as np
+from .instance_io import as_instance, load_instance, is_binary_instance, save_binary_instance
+from . import genetic_lscp
+from . import genetic_mclp
+
+# Filled by the pool initializer: every worker memory-maps the binary instance
+# once instead of receiving a pickled copy with its task.
+worker_instance = None
+
+def load_worker_instance(instance_dir):
+    global worker_instance
+    worker_instance = load_instance(instance_dir)
+
+def migration_partners(island, num_islands, topology, topology_rng):
+    if topology == "ring":
+        return (island + 1) % num_islands, (island - 1) % num_islands
+    if topology == "random":
+        # Every island draws the same permutation, so senders and receivers agree.
+        targets = topology_rng.permutation(num_islands)
+        return int(targets[island]), int(np.flatnonzero(targets == island)[0])
+    raise ValueError(f"Unknown topology: {topology}")
+
+def init_island(problem, params, rng):
+    instance = worker_instance
+    if problem == "LSCP":
+        context = genetic_lscp.lscp_context(instance["weight"], instance["indptr"], instance["indices"])
+        state = genetic_lscp.init_lscp_state(context, params["initialSolutions"], rng)
+    else:
+        nearest = np.load(params["nearest_file"], mmap_mode="r")
+        context = genetic_mclp.bitset_context(instance["indptr"], instance["indices"], nearest)
+        state = genetic_mclp.init_mclp_state(context, params["initial_solutions"], params["k"], params["mutation_rate_initial"], rng)
+    state["bound"], state["target_gap"] = params.get("bound"), params.get("target_gap") or 0.0
+    return context, state
+
+def bound_reached(problem, state):
+    if problem == "LSCP":
+        return genetic_lscp.bound_reached(state)
+    return genetic_mclp.bound_reached_mclp(state)
+
+def evolve_island(problem, params, context, state, migration_interval):
+    if problem == "LSCP":
+        iterations = min(migration_interval, params["Mutations"] - state["t"])
+        genetic_lscp.evolve_lscp(state, context, iterations, params["mf"], params["mc"], params["mg"])
+        return state["t"] >= params["Mutations"]
+    genetic_mclp.evolve_mclp(state, context, migration_interval, params["crossover_rate"], params["mutation_rate_final"])
+    return state["done"] or state["loop_counter"] >= params["max_generations"]
+
+def emigrants(problem, state, num_migrants):
+    if problem == "LSCP":
+        return state["population"][genetic_lscp.best_member_indices(state, num_migrants)].copy()
+    return state["population"][genetic_mclp.best_member_indices_mclp(state, num_migrants)].copy()
+
+def immigrate(problem, context, state, migrants):
+    if problem == "LSCP":
+        genetic_lscp.receive_migrants(state, context, migrants)
+    else:
+        genetic_mclp.receive_migrants_mclp(state, context, migrants)
+
+def run_island(island, num_islands, problem, params, seed_sequence, topology_seed, topology, migration_interval, num_migrants, board, barrier):
+    # An island that fails aborts the barrier, so the others stop waiting and
+    # return None; the failing island's own exception is what the pool reports.
+    try:
+        context, state = init_island(problem, params, np.random.default_rng(seed_sequence))
+        topology_rng = np.random.default_rng(topology_seed)
+        epoch = 0
+        while True:
+            done = evolve_island(problem, params, context, state, migration_interval)
+            board[(epoch, island)] = (emigrants(problem, state, num_migrants), done, bound_reached(problem, state))
+            barrier.wait()
+            target, source = migration_partners(island, num_islands, topology, topology_rng)
+            # One island within the target gap of the bound ends the whole run.
+            posts = [board[(epoch, other)] for other in range(num_islands)]
+            all_done = all(post[1] for post in posts) or any(post[2] for post in posts)
+            if source != island:
+                immigrate(problem, context, state, board[(epoch, source)][0])
+            barrier.wait()
+            del board[(epoch, island)]
+            if all_done:
+                break
+            epoch += 1
+    except threading.BrokenBarrierError:
+        return None
+    except BaseException:
+        barrier.abort()
+        raise
+    if problem == "LSCP":
+        best = int(np.argmin(state["fitness_values"]))
+    else:
+        best = int(np.argmax(state["fitness_values"]))
+    return island, int(state["fitness_values"][best]), state["population"][best].tolist()
+
+def run_islands(instance_file, problem, params, num_islands=4, migration_interval=50, num_migrants=2, topology="ring", seed=None):
+    # Workers memory-map a binary instance directory; JSON files and in-memory
+    # instances are written to a temporary one first.
+    temporary_dir = None
+    if not (isinstance(instance_file, str) and is_binary_instance(instance_file)):
+        temporary_dir = tempfile.mkdtemp()
+        save_binary_instance(os.path.join(temporary_dir, "instance"), as_instance(instance_file))
+        instance_file = os.path.join(temporary_dir, "instance")
+    try:
+        params = dict(params)
+        if problem == "MCLP":
+            instance = load_instance(instance_file)
+            genetic_mclp.load_nearest_neighbour_matrix(instance_file, instance["x"], instance["y"], params["percentage_nearest_neighbours"])
+            params["nearest_file"] = genetic_mclp.nearest_cache_path(instance_file, genetic_mclp.num_nearest_neighbours(len(instance["x"]), params["percentage_nearest_neighbours"]))
+            params.setdefault("max_generations", 100000)
+        seed_sequence = np.random.SeedSequence(seed)
+        island_seeds = seed_sequence.spawn(num_islands + 1)
+        with mp.Manager() as manager:
+            board = manager.dict()
+            barrier = manager.Barrier(num_islands)
+            tasks = [
+                (island, num_islands, problem, params, island_seeds[island], island_seeds[-1], topology, migration_interval, num_migrants, board, barrier)
+                for island in range(num_islands)
+            ]
+            with mp.Pool(num_islands, initializer=load_worker_instance, initargs=(instance_file,)) as pool:
+                results = [result for result in pool.starmap(run_island, tasks, chunksize=1) if result is not None]
+    finally:
+        if temporary_dir is not None:
+            shutil.rmtree(temporary_dir)
+    if problem == "LSCP":
+        return min(results, key=lambda result: (result[1], result[0]))
+    return max(results, key=lambda result: (result[1], -result[0]))
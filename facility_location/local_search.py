@@ -0,0 +1,356 @@
+import itertools
+import time
+import numpy as np
+from .instance_io import as_instance
+from .coverage import covered_by_index, gather_rows
+
+# Both searches keep count[e], the number of selected facilities covering
+# element e, and update their per-facility tables only for the facilities
+# around the elements whose count changed, so a move costs O(neighbourhood).
+# Finding the best MCLP swap also scans the gains once, O(n).
+
+# Default budget in seconds; None runs until no move improves.
+LOCAL_SEARCH_TIME = 60.0
+
+def search_context(instance):
+    instance = as_instance(instance)
+    indptr, indices = np.asarray(instance["indptr"]), np.asarray(instance["indices"])
+    n = len(indptr) - 1
+    covered_by_indptr, covered_by_indices = covered_by_index(indptr, indices, n)
+    return {
+        "indptr": indptr,
+        "indices": indices.astype(np.int64),
+        "covered_by_indptr": covered_by_indptr,
+        "covered_by_indices": covered_by_indices.astype(np.int64),
+        "weight": np.asarray(instance["weight"], dtype=np.int64),
+        "n": n,
+        # Zeroed scratch space for per-facility sums over short id lists.
+        "sums": np.zeros(n, dtype=np.int64),
+        "last": np.zeros(n, dtype=np.int64)
+    }
+
+def row(context, facility):
+    return context["indices"][context["indptr"][facility]:context["indptr"][facility + 1]]
+
+def coverers(context, elements):
+    return gather_rows(context["covered_by_indptr"], context["covered_by_indices"], elements)
+
+def out_of_time(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+# MCLP: maximize covered demand with p facilities.
+#   gain[g]     demand g would newly cover (meaningful for unselected g)
+#   loss[f]     demand only f covers (meaningful for selected f)
+#   owner[e]    sum of the selected facilities covering e, i.e. the sole
+#               coverer whenever count[e] == 1
+#   extras[s]   (facilities, demand) for the facility in slot s: demand only
+#               it covers that each listed facility g covers too, so swapping
+#               it for g changes coverage by gain[g] - loss[f] + extra. Every
+#               facility not listed has extra 0.
+# A slot's extras depend only on the counts along its own row, so a move
+# marks just the slots owning elements it touches as stale.
+
+def slot_extras(context, tables, facility, demand):
+    elements = row(context, facility)
+    elements = elements[tables["count"][elements] == 1]
+    facilities, lengths = coverers(context, elements)
+    values = np.repeat(demand[elements], lengths)
+    # The demand is summed per facility id in O(len(facilities)): through a
+    # full-length bincount only when the list is longer than that anyway.
+    if len(facilities) > context["n"]:
+        extra = np.bincount(facilities, weights=values, minlength=context["n"]).astype(np.int64)
+        listed = np.flatnonzero(extra)
+        return listed, extra[listed]
+    sums, last = context["sums"], context["last"]
+    np.add.at(sums, facilities, values)
+    positions = np.arange(len(facilities))
+    last[facilities] = positions
+    listed = np.sort(facilities[last[facilities] == positions])
+    extra = sums[listed].copy()
+    sums[listed] = 0
+    return listed, extra
+
+def mark_owners_stale(tables, elements):
+    elements = elements[tables["count"][elements] == 1]
+    tables["stale"].update(np.unique(tables["owner"][elements]).tolist())
+
+def refresh_extras(context, tables, demand):
+    for facility in tables["stale"]:
+        if tables["selected"][facility]:
+            tables["extras"][tables["slot"][facility]] = slot_extras(context, tables, facility, demand)
+    tables["stale"].clear()
+
+def init_mclp_tables(context, selected, demand, maximumFacilities):
+    n = context["n"]
+    count = np.zeros(n, dtype=np.int64)
+    elements, _ = gather_rows(context["indptr"], context["indices"], selected)
+    np.add.at(count, elements, 1)
+    facility_of_entry = np.repeat(np.arange(n), np.diff(context["indptr"]))
+    entry_demand = demand[context["indices"]]
+    gain = np.bincount(facility_of_entry, weights=entry_demand * (count[context["indices"]] == 0), minlength=n).astype(np.int64)
+    loss = np.bincount(facility_of_entry, weights=entry_demand * (count[context["indices"]] == 1), minlength=n).astype(np.int64)
+    owner = np.zeros(n, dtype=np.int64)
+    slot = np.full(n, -1, dtype=np.int64)
+    for position, facility in enumerate(selected):
+        owner[row(context, facility)] += facility
+        slot[facility] = position
+    is_selected = np.zeros(n, dtype=bool)
+    is_selected[selected] = True
+    return {
+        "count": count,
+        "owner": owner,
+        "gain": gain,
+        "loss": loss * is_selected,
+        "selected": is_selected,
+        "slot": slot,
+        "free_slots": list(range(maximumFacilities - 1, len(selected) - 1, -1)),
+        "extras": [None] * maximumFacilities,
+        "stale": set(selected)
+    }
+
+def add_facility_mclp(context, tables, facility, demand):
+    count, gain, loss = tables["count"], tables["gain"], tables["loss"]
+    elements = row(context, facility)
+    mark_owners_stale(tables, elements)
+    # 1 -> 2: the previous sole coverer loses the element from its loss.
+    becoming_shared = elements[count[elements] == 1]
+    if len(becoming_shared):
+        np.subtract.at(loss, tables["owner"][becoming_shared], demand[becoming_shared])
+    # 0 -> 1: nobody can gain it any more, and it is the new facility's loss.
+    newly_covered = elements[count[elements] == 0]
+    if len(newly_covered):
+        facilities, lengths = coverers(context, newly_covered)
+        np.subtract.at(gain, facilities, np.repeat(demand[newly_covered], lengths))
+    count[elements] += 1
+    tables["owner"][elements] += facility
+    tables["selected"][facility] = True
+    tables["slot"][facility] = tables["free_slots"].pop()
+    loss[facility] = demand[newly_covered].sum()
+    tables["stale"].add(facility)
+
+def remove_facility_mclp(context, tables, facility, demand):
+    count, gain, loss = tables["count"], tables["gain"], tables["loss"]
+    elements = row(context, facility)
+    count[elements] -= 1
+    tables["owner"][elements] -= facility
+    tables["selected"][facility] = False
+    tables["free_slots"].append(int(tables["slot"][facility]))
+    tables["extras"][tables["slot"][facility]] = None
+    tables["slot"][facility] = -1
+    loss[facility] = 0
+    # 1 -> 0: every facility covering it can gain it again.
+    uncovered = elements[count[elements] == 0]
+    if len(uncovered):
+        facilities, lengths = coverers(context, uncovered)
+        np.add.at(gain, facilities, np.repeat(demand[uncovered], lengths))
+    # 2 -> 1: the remaining coverer now owns it alone.
+    becoming_unique = elements[count[elements] == 1]
+    if len(becoming_unique):
+        np.add.at(loss, tables["owner"][becoming_unique], demand[becoming_unique])
+    mark_owners_stale(tables, elements)
+
+def best_one_swap(context, tables, selected, demand):
+    # For every slot the best partner is either a listed facility or, with
+    # extra 0, the unselected facility of the highest gain overall.
+    refresh_extras(context, tables, demand)
+    gain, is_selected = tables["gain"], tables["selected"]
+    open_gain = np.where(is_selected, -1, gain)
+    top = int(np.argmax(open_gain))
+    best, best_delta = None, 0
+    for facility in selected:
+        candidate, value = top, int(open_gain[top])
+        listed, extra = tables["extras"][tables["slot"][facility]]
+        if len(listed):
+            values = np.where(is_selected[listed], -1, gain[listed] + extra)
+            position = int(np.argmax(values))
+            if values[position] > value or (values[position] == value and listed[position] < candidate):
+                candidate, value = int(listed[position]), int(values[position])
+        delta = value - int(tables["loss"][facility])
+        if delta > best_delta:
+            best, best_delta = (facility, candidate), delta
+    return best, best_delta
+
+def swap_delta(context, tables, removed, added, demand):
+    # Exact change in covered demand for an arbitrary swap, from the counts of
+    # the elements the involved facilities touch.
+    elements = np.concatenate([row(context, f) for f in removed + added])
+    signs = np.concatenate([np.full(len(row(context, f)), -1 if i < len(removed) else 1) for i, f in enumerate(removed + added)])
+    touched, positions = np.unique(elements, return_inverse=True)
+    change = np.bincount(positions, weights=signs, minlength=len(touched))
+    before = tables["count"][touched] > 0
+    after = tables["count"][touched] + change > 0
+    return int(demand[touched][after & ~before].sum() - demand[touched][before & ~after].sum())
+
+def best_two_swap(context, tables, selected, demand, num_candidates, deadline):
+    # Only called once no single swap improves, i.e. gain[a] - loss[r] +
+    # extra(r, a) <= 0 for all r, a. Swapping {r1, r2} for {a1, a2} changes
+    # coverage by at most gain[a1] + gain[a2] - loss[r1] - loss[r2] plus the
+    # extras of the four (r, a) pairs, so pairing r1-a1, r2-a2 bounds it by
+    # extra(r1, a2) + extra(r2, a1) and pairing r1-a2, r2-a1 by extra(r1, a1)
+    # + extra(r2, a2). Both must be positive, which rules out every swap
+    # whose added facilities miss the demand the removed ones cover alone.
+    refresh_extras(context, tables, demand)
+    unselected = np.flatnonzero(~tables["selected"])
+    candidates = unselected[np.argsort(-tables["gain"][unselected], kind="stable")[:num_candidates]]
+    listed = np.array([np.isin(candidates, tables["extras"][tables["slot"][facility]][0]) for facility in selected]).reshape(len(selected), len(candidates))
+    first, second = np.triu_indices(len(candidates), 1)
+    best, best_delta = None, 0
+    for i, j in itertools.combinations(range(len(selected)), 2):
+        if out_of_time(deadline):
+            break
+        if not (listed[i].any() or listed[j].any()):
+            continue
+        possible = (listed[i][second] | listed[j][first]) & (listed[i][first] | listed[j][second])
+        for a, b in zip(first[possible].tolist(), second[possible].tolist()):
+            removed, added = [selected[i], selected[j]], [int(candidates[a]), int(candidates[b])]
+            delta = swap_delta(context, tables, removed, added, demand)
+            if delta > best_delta:
+                best, best_delta = (removed, added), delta
+    return best, best_delta
+
+def local_search_mclp(instance, facilities, maximumFacilities=None, weighted=False, time_limit=LOCAL_SEARCH_TIME, two_swap=True, num_candidates=10):
+    instance = as_instance(instance)
+    if maximumFacilities is None:
+        maximumFacilities = instance["maximumFacilities"]
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    context = search_context(instance)
+    demand = context["weight"] if weighted else np.ones(context["n"], dtype=np.int64)
+    selected = list(dict.fromkeys(int(facility) for facility in facilities))[:maximumFacilities]
+    tables = init_mclp_tables(context, selected, demand, maximumFacilities)
+    moves = 0
+
+    # Free slots (e.g. after a short start solution) are filled greedily first.
+    while len(selected) < maximumFacilities:
+        candidate = int(np.argmax(np.where(tables["selected"], -1, tables["gain"])))
+        if tables["gain"][candidate] <= 0:
+            break
+        add_facility_mclp(context, tables, candidate, demand)
+        selected.append(candidate)
+        moves += 1
+
+    while not out_of_time(deadline):
+        move, delta = best_one_swap(context, tables, selected, demand)
+        if move is not None:
+            removed, added = [move[0]], [move[1]]
+        elif two_swap and len(selected) >= 2:
+            move, delta = best_two_swap(context, tables, selected, demand, num_candidates, deadline)
+            if move is None:
+                break
+            removed, added = move
+        else:
+            break
+        for facility in removed:
+            remove_facility_mclp(context, tables, facility, demand)
+            selected.remove(facility)
+        for facility in added:
+            add_facility_mclp(context, tables, facility, demand)
+            selected.append(facility)
+        moves += 1
+
+    covered = tables["count"] > 0
+    result = {"result": selected, "total_points_covered": int(covered.sum()), "moves": moves}
+    if weighted:
+        result["total_weight_covered"] = int(context["weight"][covered].sum())
+    return result
+
+# LSCP: cover every element at minimum weight.
+#   unique[f] number of elements only f covers; f is redundant when it is 0
+#   owner[e]  as for MCLP
+
+def init_lscp_tables(context, selected):
+    n = context["n"]
+    count = np.zeros(n, dtype=np.int64)
+    owner = np.zeros(n, dtype=np.int64)
+    for facility in selected:
+        elements = row(context, facility)
+        count[elements] += 1
+        owner[elements] += facility
+    unique = np.zeros(n, dtype=np.int64)
+    single = np.flatnonzero(count == 1)
+    np.add.at(unique, owner[single], 1)
+    is_selected = np.zeros(n, dtype=bool)
+    is_selected[selected] = True
+    return {"count": count, "owner": owner, "unique": unique, "selected": is_selected}
+
+def add_facility_lscp(context, tables, facility):
+    count, owner, unique = tables["count"], tables["owner"], tables["unique"]
+    elements = row(context, facility)
+    becoming_shared = elements[count[elements] == 1]
+    np.subtract.at(unique, owner[becoming_shared], 1)
+    newly_covered = elements[count[elements] == 0]
+    count[elements] += 1
+    owner[elements] += facility
+    unique[facility] = len(newly_covered)
+    tables["selected"][facility] = True
+
+def remove_facility_lscp(context, tables, facility):
+    count, owner, unique = tables["count"], tables["owner"], tables["unique"]
+    elements = row(context, facility)
+    count[elements] -= 1
+    owner[elements] -= facility
+    unique[facility] = 0
+    tables["selected"][facility] = False
+    becoming_unique = elements[count[elements] == 1]
+    np.add.at(unique, owner[becoming_unique], 1)
+
+def drop_redundant(context, tables, selected):
+    weights = context["weight"]
+    dropped = []
+    for facility in sorted(selected, key=lambda facility: (-weights[facility], facility)):
+        if tables["unique"][facility] == 0:
+            remove_facility_lscp(context, tables, facility)
+            dropped.append(facility)
+    return dropped
+
+def add_and_drop(context, tables, candidate):
+    # Facilities that become redundant once candidate is in: every element
+    # they cover alone is also covered by candidate.
+    weights = context["weight"]
+    elements = row(context, candidate)
+    single = elements[tables["count"][elements] == 1]
+    owners, hits = np.unique(tables["owner"][single], return_counts=True)
+    droppable = owners[hits == tables["unique"][owners]]
+    if weights[droppable].sum() <= weights[candidate]:
+        return None
+    add_facility_lscp(context, tables, candidate)
+    dropped = drop_redundant(context, tables, droppable.tolist())
+    if weights[dropped].sum() > weights[candidate]:
+        return dropped
+    for facility in dropped:
+        add_facility_lscp(context, tables, facility)
+    remove_facility_lscp(context, tables, candidate)
+    return None
+
+def local_search_lscp(instance, facilities, time_limit=LOCAL_SEARCH_TIME):
+    instance = as_instance(instance)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    context = search_context(instance)
+    weights = context["weight"]
+    selected = set(int(facility) for facility in facilities)
+    tables = init_lscp_tables(context, sorted(selected))
+    if (tables["count"] == 0).any():
+        raise ValueError("Start solution for the LSCP local search does not cover every element")
+    moves = 0
+
+    selected.difference_update(drop_redundant(context, tables, selected))
+    improved = True
+    while improved and not out_of_time(deadline):
+        improved = False
+        # Only facilities covering an element some selected facility covers
+        # alone can make that facility redundant.
+        single = np.flatnonzero(tables["count"] == 1)
+        candidates, _ = coverers(context, single)
+        candidates = np.unique(candidates[~tables["selected"][candidates]])
+        for candidate in candidates[np.argsort(weights[candidates], kind="stable")].tolist():
+            if out_of_time(deadline):
+                break
+            if tables["selected"][candidate]:
+                continue
+            dropped = add_and_drop(context, tables, candidate)
+            if dropped is not None:
+                selected.add(candidate)
+                selected.difference_update(dropped)
+                moves += 1
+                improved = True
+    result = sorted(selected)
+    return {"result": result, "total_weight": int(weights[result].sum()), "moves": moves}
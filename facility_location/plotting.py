@@ -0,0 +1,71 @@
+import json
+import math
+import numpy as np
+from matplotlib.collections import EllipseCollection
+from .instance_io import as_instance
+
+def load_solution(solution_file):
+    with open(solution_file, "r") as file:
+        return json.load(file)["result"]
+
+def label_ids(num_points, selected, max_labels):
+    # Facilities in the solution are always labelled; the remaining label
+    # budget is spread evenly over the other points.
+    if max_labels is None:
+        return np.arange(num_points)
+    step = max(1, math.ceil(num_points / max_labels)) if max_labels > 0 else num_points + 1
+    return np.union1d(np.asarray(selected, dtype=np.int64), np.arange(0, num_points, step))
+
+def circles(ax, x, y, radius, filled, rasterized):
+    collection = EllipseCollection(
+        2 * radius, 2 * radius, 0, units="xy", offsets=np.column_stack((x, y)), offset_transform=ax.transData,
+        facecolors="red" if filled else "none", edgecolors="red", alpha=0.5, rasterized=rasterized
+    )
+    ax.add_collection(collection)
+
+def render(instance, selected=None, show_radii=True, max_labels=200, density=False, output=None, title=None):
+    instance = as_instance(instance)
+    x, y, radius = np.asarray(instance["x"]), np.asarray(instance["y"]), instance["radius"]
+    selected = np.asarray([] if selected is None else selected, dtype=np.int64)
+    num_points = len(x)
+    # Large plots keep vector output small by rasterizing the dense layers.
+    rasterized = num_points > 10000
+
+    if output is None:
+        import matplotlib.pyplot as plt
+        figure = plt.figure()
+    else:
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=(10, 10))
+    ax = figure.add_subplot()
+
+    if density:
+        ax.hexbin(x, y, gridsize=200, bins="log", cmap="Blues", mincnt=1, rasterized=True)
+    else:
+        ax.scatter(x, y, s=5, color="blue", rasterized=rasterized)
+    if show_radii:
+        unselected = np.ones(num_points, dtype=bool)
+        unselected[selected] = False
+        if density:
+            # Every circle at this scale is noise; keep only the solution.
+            unselected[:] = False
+        circles(ax, x[unselected], y[unselected], radius, False, rasterized)
+        circles(ax, x[selected], y[selected], radius, True, rasterized)
+    if max_labels != 0:
+        for i in label_ids(num_points, selected, max_labels).tolist():
+            ax.text(x[i], y[i], str(i), fontsize=8, ha="left", va="bottom", color="black")
+
+    margin = radius if show_radii else 0
+    ax.set_xlim(x.min() - margin, x.max() + margin)
+    ax.set_ylim(y.min() - margin, y.max() + margin)
+    ax.set_aspect("equal", adjustable="box")
+    ax.set_xlabel("X")
+    ax.set_ylabel("Y")
+    ax.set_title(title or f"Population Points with Radii (Total Points: {instance['total_points']})")
+    ax.grid(True)
+
+    if output is None:
+        plt.show()
+    else:
+        figure.savefig(output, dpi=150)
+    return figure
@@ -0,0 +1,109 @@
+import numpy as np
+
+def row_and_column_sets(indptr, indices):
+    # Row i is the set of facilities that can cover element i, column j the
+    # set of elements facility j covers.
+    indptr, indices = np.asarray(indptr).tolist(), np.asarray(indices).tolist()
+    rows = {i: set(indices[indptr[i]:indptr[i + 1]]) for i in range(len(indptr) - 1)}
+    columns = {j: set() for j in range(len(indptr) - 1)}
+    for i, row in rows.items():
+        for j in row:
+            columns[j].add(i)
+    return rows, columns
+
+def remove_column(rows, columns, j):
+    for i in columns.pop(j):
+        rows[i].discard(j)
+
+def remove_row(rows, columns, i):
+    for j in rows.pop(i):
+        columns[j].discard(i)
+
+def fix_essential_columns(rows, columns, fixed):
+    changed = False
+    for i in [i for i, row in rows.items() if len(row) == 1]:
+        if i not in rows:
+            continue
+        j = next(iter(rows[i]))
+        fixed.append(j)
+        for covered in list(columns[j]):
+            remove_row(rows, columns, covered)
+        remove_column(rows, columns, j)
+        changed = True
+    return changed
+
+def remove_dominated_rows(rows, columns):
+    # Covering a row also covers every row whose facility set is a superset,
+    # so the superset row is redundant. Of two equal rows the higher id goes.
+    changed = False
+    for i in sorted(rows, key=lambda i: (len(rows[i]), i)):
+        if i not in rows or not rows[i]:
+            continue
+        row = rows[i]
+        pivot = min(row, key=lambda j: len(columns[j]))
+        for other in list(columns[pivot]):
+            if other != i and len(rows[other]) >= len(row) and row <= rows[other] and (len(rows[other]) > len(row) or other > i):
+                remove_row(rows, columns, other)
+                changed = True
+    return changed
+
+def remove_dominated_columns(rows, columns, weights):
+    # A facility covering a subset of what an equal or cheaper facility covers
+    # is never needed. Of two identical facilities the higher id goes.
+    changed = False
+    for j in [j for j, column in columns.items() if not column]:
+        del columns[j]
+        changed = True
+    for j in sorted(columns, key=lambda j: (len(columns[j]), j)):
+        if j not in columns:
+            continue
+        column = columns[j]
+        pivot = min(column, key=lambda i: len(rows[i]))
+        for other in rows[pivot]:
+            if other == j or weights[other] > weights[j] or len(columns[other]) < len(column) or not column <= columns[other]:
+                continue
+            if len(columns[other]) > len(column) or weights[other] < weights[j] or other < j:
+                remove_column(rows, columns, j)
+                changed = True
+                break
+    return changed
+
+def presolve_set_cover(indptr, indices, weights):
+    weights = np.asarray(weights).tolist()
+    rows, columns = row_and_column_sets(indptr, indices)
+    original_rows, original_columns = len(rows), len(columns)
+    fixed = []
+    while True:
+        if any(not row for row in rows.values()):
+            raise ValueError("Set covering instance is infeasible: an element has no covering facility")
+        changed = fix_essential_columns(rows, columns, fixed)
+        changed = remove_dominated_rows(rows, columns) or changed
+        changed = remove_dominated_columns(rows, columns, weights) or changed
+        if not changed:
+            break
+
+    # Reduced problem in local ids; column_ids maps them back.
+    row_ids = sorted(rows)
+    column_ids = sorted(columns)
+    local = {j: position for position, j in enumerate(column_ids)}
+    reduced_indptr = np.zeros(len(row_ids) + 1, dtype=np.int64)
+    np.cumsum([len(rows[i]) for i in row_ids], out=reduced_indptr[1:])
+    reduced_indices = np.array([local[j] for i in row_ids for j in sorted(rows[i])], dtype=np.int64)
+    return {
+        "fixed": sorted(fixed),
+        "row_ids": row_ids,
+        "column_ids": column_ids,
+        "indptr": reduced_indptr,
+        "indices": reduced_indices,
+        "weight": [weights[j] for j in column_ids],
+        "stats": {
+            "original_rows": original_rows,
+            "original_columns": original_columns,
+            "rows": len(row_ids),
+            "columns": len(column_ids),
+            "fixed": len(fixed)
+        }
+    }
+
+def map_back(presolved, local_columns):
+    return sorted(presolved["fixed"] + [presolved["column_ids"][j] for j in local_columns])
@@ -0,0 +1,209 @@
+import numpy as np
+from .instance_io import as_instance, arrays_to_points_data
+from . import exact_lscp, exact_mclp, greedy_lscp, greedy_mclp, genetic_lscp, genetic_mclp
+from .local_search import local_search_lscp, local_search_mclp, LOCAL_SEARCH_TIME
+from .bounds import lscp_lower_bound, mclp_upper_bound, relative_gap
+from .instrumentation import instrumentation, summary
+
+GENETIC_LSCP_PARAMS = {
+    "initialSolutions": 100,
+    "mf": 10,
+    "mc": 500,
+    "mg": 0.5,
+    "Mutations": 1000,
+    "warm_start": None,
+    "target_gap": 0.0,
+    "profile": False,
+    "trace_file": None,
+    "trace_interval": 1,
+    "hooks": None,
+    "checkpoint_file": None,
+    "checkpoint_interval": 100,
+    "resume": False
+}
+GENETIC_MCLP_PARAMS = {
+    "percentage_nearest_neighbours": 5,
+    "nearest": None,
+    "initial_solutions": 20,
+    "crossover_rate": 0.9,
+    "mutation_rate_initial": 0.05,
+    "mutation_rate_final": 0.8,
+    "warm_start": None,
+    "target_gap": 0.0,
+    "profile": False,
+    "trace_file": None,
+    "trace_interval": 1,
+    "hooks": None,
+    "checkpoint_file": None,
+    "checkpoint_interval": 100,
+    "resume": False
+}
+EXACT_PARAMS = {"warm_start": None, "time_limit": None, "gap": None}
+ISLAND_PARAMS = {"num_islands": 4, "migration_interval": 50, "num_migrants": 2, "topology": "ring"}
+
+def lscp_solution(instance, chromosome):
+    selected_sets = np.flatnonzero(np.asarray(chromosome)).tolist()
+    return {"result": selected_sets, "total_weight": int(np.asarray(instance["weight"])[selected_sets].sum())}
+
+def warm_start(start, solve):
+    # A starting solution for the exact and genetic solvers: facility ids as
+    # given, or the result of a heuristic run named by its method.
+    if isinstance(start, str):
+        return solve(start)["result"]
+    return start
+
+def seed_solutions(start):
+    return None if start is None else [start]
+
+def lscp_bound(instance, target_gap):
+    # The genetic runs stop once they are within target_gap of this bound;
+    # None switches the bound off. Greedy gives the subgradient its target.
+    if target_gap is None:
+        return None
+    return lscp_lower_bound(instance, greedy_lscp.lazy_greedy_set_covering(instance)["total_weight"])
+
+def mclp_bound(instance, p, target_gap):
+    # The genetic MCLP fitness counts points, so the bound is unweighted.
+    if target_gap is None:
+        return None
+    greedy = greedy_mclp.incremental_greedy_set_covering(instance, p)
+    return mclp_upper_bound(instance, p, facilities=greedy["result"], lower_bound=greedy["total_points_covered"])
+
+def with_gap(solution, objective, bound):
+    if bound is not None:
+        solution["bound"] = bound
+        solution["gap"] = relative_gap(solution[objective], bound)
+    return solution
+
+def check_single_population(params, engine):
+    # Instrumentation and checkpoints cover the single-population engines.
+    requested = [key for key in ("profile", "trace_file", "hooks", "checkpoint_file") if params[key]]
+    if requested and engine not in (None, "matrix", "bitset"):
+        raise ValueError(f"{', '.join(requested)} not available for the {engine} engine")
+
+def genetic_instrumentation(params, engine):
+    # Operator timings, the generation trace and hooks: see instrumentation.py.
+    check_single_population(params, engine)
+    if not (params["profile"] or params["trace_file"] is not None or params["hooks"]):
+        return None
+    return instrumentation(params["trace_file"], params["hooks"], params["trace_interval"])
+
+def checkpoint_options(params):
+    return {key: params[key] for key in ("checkpoint_file", "checkpoint_interval", "resume")}
+
+def with_profile(solution, instr):
+    if instr is not None:
+        solution["profile"] = summary(instr)
+    return solution
+
+def improved(solution, search, objective):
+    # The local search result replaces the solver's answer; the remaining
+    # keys (exact solver status, presolve statistics, ...) are kept. A bound
+    # still holds for the new objective, so the incumbent and gap follow it.
+    solution = dict(solution)
+    moves = search.pop("moves")
+    solution.update(search)
+    solution["local_search_moves"] = moves
+    if "incumbent" in solution:
+        solution["incumbent"] = solution[objective]
+    if "bound" in solution:
+        solution["gap"] = relative_gap(solution[objective], solution["bound"])
+    return solution
+
+def solve_lscp(instance, method="greedy", engine=None, seed=None, params=None, island_params=None, local_search=False, local_search_time=LOCAL_SEARCH_TIME):
+    instance = as_instance(instance)
+    solution = run_lscp_method(instance, method, engine, seed, params, island_params)
+    if local_search:
+        solution = improved(solution, local_search_lscp(instance, solution["result"], local_search_time), "total_weight")
+    return solution
+
+def solve_mclp(instance, p, method="greedy", engine=None, seed=None, params=None, island_params=None, weighted=False, instance_file=None, local_search=False, local_search_time=LOCAL_SEARCH_TIME):
+    instance = as_instance(instance)
+    solution = run_mclp_method(instance, p, method, engine, seed, params, island_params, weighted, instance_file)
+    if local_search:
+        solution = improved(solution, local_search_mclp(instance, solution["result"], p, weighted, local_search_time), "total_points_covered")
+    return solution
+
+def run_lscp_method(instance, method, engine, seed, params, island_params):
+    if method == "exact":
+        e = dict(EXACT_PARAMS, **(params or {}))
+        start = warm_start(e.pop("warm_start"), lambda method: solve_lscp(instance, method, seed=seed))
+        return exact_lscp.set_covering(instance, start=start, **e)
+    if method == "greedy":
+        if engine in (None, "lazy"):
+            return greedy_lscp.lazy_greedy_set_covering(instance)
+        if engine == "legacy":
+            return greedy_lscp.greedy_set_covering(arrays_to_points_data(instance)["points_data"])
+        raise ValueError(f"Unknown greedy engine: {engine}")
+    if method == "genetic":
+        p = dict(GENETIC_LSCP_PARAMS, **(params or {}))
+        instr = genetic_instrumentation(p, engine)
+        if engine in (None, "matrix"):
+            bound = lscp_bound(instance, p["target_gap"])
+            start = seed_solutions(warm_start(p["warm_start"], lambda method: solve_lscp(instance, method, seed=seed)))
+            population, fitness_values = genetic_lscp.genetic_algorithm_matrix(
+                instance, p["initialSolutions"], p["mf"], p["mc"], p["mg"], p["Mutations"], seed,
+                start=start, bound=bound, target_gap=p["target_gap"], instrumentation=instr, **checkpoint_options(p)
+            )
+            solution = lscp_solution(instance, population[int(np.argmin(fitness_values))])
+            return with_profile(with_gap(solution, "total_weight", bound), instr)
+        if engine == "islands":
+            from .islands import run_islands
+            p["bound"] = lscp_bound(instance, p["target_gap"])
+            _, _, chromosome = run_islands(instance, "LSCP", p, seed=seed, **dict(ISLAND_PARAMS, **(island_params or {})))
+            return with_gap(lscp_solution(instance, chromosome), "total_weight", p["bound"])
+        if engine == "list":
+            points_data = arrays_to_points_data(instance)["points_data"]
+            population = genetic_lscp.genetic_algorithm_list(points_data, p["initialSolutions"], p["mf"], p["mc"], p["mg"], p["Mutations"])
+            return lscp_solution(instance, min(population, key=lambda solution: genetic_lscp.fitness_function(points_data, solution)))
+        raise ValueError(f"Unknown genetic engine: {engine}")
+    raise ValueError(f"Unknown method: {method}")
+
+def run_mclp_method(instance, p, method, engine, seed, params, island_params, weighted, instance_file):
+    if method == "exact":
+        e = dict(EXACT_PARAMS, **(params or {}))
+        start = warm_start(e.pop("warm_start"), lambda method: solve_mclp(instance, p, method, seed=seed, weighted=weighted, instance_file=instance_file))
+        return exact_mclp.set_covering(instance, p, start=start, **e)
+    if method == "greedy":
+        if engine in (None, "incremental"):
+            return greedy_mclp.incremental_greedy_set_covering(instance, p, weighted)
+        if engine == "legacy":
+            return greedy_mclp.greedy_set_covering(arrays_to_points_data(instance)["points_data"], p)
+        raise ValueError(f"Unknown greedy engine: {engine}")
+    if method == "genetic":
+        g = dict(GENETIC_MCLP_PARAMS, **(params or {}))
+        g["k"] = p
+        instr = genetic_instrumentation(g, engine)
+        if engine in (None, "bitset"):
+            # A precomputed neighbour matrix (params["nearest"]) is used as is;
+            # with instance_file it is cached next to the instance.
+            if g["nearest"] is not None:
+                nearest = g["nearest"]
+            elif instance_file is None:
+                k = genetic_mclp.num_nearest_neighbours(len(instance["x"]), g["percentage_nearest_neighbours"])
+                nearest = genetic_mclp.nearest_neighbour_matrix(instance["x"], instance["y"], k)
+            else:
+                nearest = genetic_mclp.load_nearest_neighbour_matrix(instance_file, instance["x"], instance["y"], g["percentage_nearest_neighbours"])
+            bound = mclp_bound(instance, p, g["target_gap"])
+            start = seed_solutions(warm_start(g["warm_start"], lambda method: solve_mclp(instance, p, method, seed=seed, weighted=weighted)))
+            best_ids, best_fitness, _ = genetic_mclp.genetic_algorithm_bitset(
+                instance, nearest, g["initial_solutions"], p, g["crossover_rate"], g["mutation_rate_initial"], g["mutation_rate_final"], seed,
+                start=start, bound=bound, target_gap=g["target_gap"], instrumentation=instr, **checkpoint_options(g)
+            )
+            solution = {"result": best_ids.tolist(), "total_points_covered": float(best_fitness)}
+            return with_profile(with_gap(solution, "total_points_covered", bound), instr)
+        if engine == "islands":
+            from .islands import run_islands
+            options = dict(ISLAND_PARAMS, migration_interval=20)
+            options.update(island_params or {})
+            g["bound"] = mclp_bound(instance, p, g["target_gap"])
+            _, best_fitness, best_ids = run_islands(instance if instance_file is None else instance_file, "MCLP", g, seed=seed, **options)
+            return with_gap({"result": best_ids, "total_points_covered": float(best_fitness)}, "total_points_covered", g["bound"])
+        if engine == "list":
+            points_data = arrays_to_points_data(instance)["points_data"]
+            best_solution, best_fitness, _ = genetic_mclp.genetic_algorithm_list(
+                points_data, g["initial_solutions"], p, g["crossover_rate"], g["mutation_rate_initial"], g["mutation_rate_final"], g["percentage_nearest_neighbours"]
+            )
+            return {"result": [point["id"] for point in best_solution], "total_points_covered": float(best_fitness)}
+        raise ValueError(f"Unknown genetic engine: {engine}")
+    raise ValueError(f"Unknown method: {method}")
@@ -0,0 +1,184 @@
+import json
+import math
+import os
+import shutil
+import numpy as np
+from numpy.lib.format import open_memmap
+from .generator import cell_pair_distances
+from .instance_io import index_dtype
+
+# Builds a binary instance directory (see instance_io.save_binary_instance)
+# without holding the coverage lists in memory. Space is cut into square tiles
+# of side >= radius, sized for the densest region, and runs of tiles in one
+# column form strips. One strip at a time, its points are searched against
+# the strip plus its halo (the points within radius of it) and their rows are
+# appended to scratch files. A last pass scatters the rows into id order.
+# Memory is bounded by the largest strip plus a few per-point arrays (tile
+# keys and order, indptr), never by the number of coverage entries.
+
+CHUNK_SIZE = 1 << 20
+
+def chunks(n, chunk_size=CHUNK_SIZE):
+    for start in range(0, n, chunk_size):
+        yield start, min(start + chunk_size, n)
+
+def copy_column(path, values, dtype):
+    column = open_memmap(path, mode="w+", dtype=dtype, shape=(len(values),))
+    for start, end in chunks(len(values)):
+        column[start:end] = values[start:end]
+    column.flush()
+    return column
+
+def choose_tile_size(x, y, radius, tile_points, tile_entries, bins=1024):
+    # Where the points are densest (measured on a bins x bins histogram) a
+    # tile holds at most about tile_points points and tile_entries coverage
+    # entries (density * pi * radius^2 per point). Tiles are never smaller than
+    # radius, so the halo lies within the eight surrounding tiles. Tile
+    # coordinates start at 1, so every tile has all eight neighbours.
+    n = len(x)
+    x_min, x_max = min(float(x[start:end].min()) for start, end in chunks(n)), max(float(x[start:end].max()) for start, end in chunks(n))
+    y_min, y_max = min(float(y[start:end].min()) for start, end in chunks(n)), max(float(y[start:end].max()) for start, end in chunks(n))
+    width, height = max(x_max - x_min, 1e-12), max(y_max - y_min, 1e-12)
+    counts = np.zeros((bins, bins), dtype=np.int64)
+    for start, end in chunks(n):
+        counts += np.histogram2d(x[start:end], y[start:end], bins=bins, range=[[x_min, x_min + width], [y_min, y_min + height]])[0].astype(np.int64)
+    max_density = counts.max() / (width * height / bins**2)
+    entries_per_point = max(1.0, max_density * math.pi * radius**2)
+    tile_size = max(radius * (1 + 1e-9), math.sqrt(min(tile_points, tile_entries / entries_per_point) / max_density))
+    return tile_size, x_min, y_min, math.floor((y_max - y_min) / tile_size) + 3
+
+def tile_keys(x, y, tile_size, x_min, y_min, span):
+    keys = np.empty(len(x), dtype=np.int64)
+    for start, end in chunks(len(x)):
+        tx = np.floor((np.asarray(x[start:end]) - x_min) / tile_size).astype(np.int64) + 1
+        ty = np.floor((np.asarray(y[start:end]) - y_min) / tile_size).astype(np.int64) + 1
+        keys[start:end] = tx * span + ty
+    return keys
+
+def member_rows(candidates, candidate_x, candidate_y, local_members, radius):
+    # grid_points_within_radius, but only for the candidates at local_members;
+    # the rest are the halo and only serve as neighbours. Distance matrices
+    # hold at most about CHUNK_SIZE entries, however dense the cell.
+    rows = [None] * len(local_members)
+    for members, near, distances in cell_pair_distances(candidate_x, candidate_y, radius, local_members, CHUNK_SIZE):
+        within = distances <= radius
+        for row, member in enumerate(members.tolist()):
+            rows[member] = candidates[near[within[row]]]
+    return rows
+
+def strip_rows(x, y, radius, order, sorted_keys, tx, first_ty, last_ty, tile_size, x_min, y_min, span):
+    # Rows of the points in tiles (tx, first_ty .. last_ty): (member ids, row
+    # lengths, indices). Neighbours come from the adjacent tile columns, whose
+    # tiles in rows first_ty - 1 .. last_ty + 1 have consecutive keys.
+    candidates = []
+    for dx in (-1, 0, 1):
+        start, end = np.searchsorted(sorted_keys, [(tx + dx) * span + first_ty - 1, (tx + dx) * span + last_ty + 2])
+        candidates.append(order[start:end])
+    # Kept in the output's index dtype, so the rows are built without copies.
+    candidates = np.sort(np.concatenate(candidates)).astype(index_dtype(len(x)))
+    candidate_x, candidate_y = np.asarray(x[candidates]), np.asarray(y[candidates])
+    # Halo: everything within radius of the strip (with the same margin as
+    # the grid cells).
+    margin = radius * (1 + 1e-9)
+    left, bottom, top = x_min + (tx - 1) * tile_size, y_min + (first_ty - 1) * tile_size, y_min + last_ty * tile_size
+    in_halo = (candidate_x >= left - margin) & (candidate_x <= left + tile_size + margin) & (candidate_y >= bottom - margin) & (candidate_y <= top + margin)
+    candidates, candidate_x, candidate_y = candidates[in_halo], candidate_x[in_halo], candidate_y[in_halo]
+    start, end = np.searchsorted(sorted_keys, [tx * span + first_ty, tx * span + last_ty + 1])
+    members = np.sort(order[start:end])
+    rows = member_rows(candidates, candidate_x, candidate_y, np.searchsorted(candidates, members), radius)
+    lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(members))
+    return members, lengths, np.concatenate(rows)
+
+def strips(keys, tile_counts, span, tile_size, radius, tile_points, tile_entries):
+    # Runs of non-empty tiles in one tile column, cut once they reach about
+    # tile_points points or tile_entries coverage entries (estimated from
+    # each tile's own density). Sparse regions thus go in long strips.
+    tile_entries_estimate = np.maximum(tile_counts, tile_counts**2 * math.pi * radius**2 / tile_size**2)
+    strip = None
+    for key, count, entries in zip(keys.tolist(), tile_counts.tolist(), tile_entries_estimate.tolist()):
+        tx, ty = divmod(key, span)
+        if strip is not None and (tx != strip[0] or strip[3] + count > tile_points or strip[4] + entries > tile_entries):
+            yield strip[:3]
+            strip = None
+        if strip is None:
+            strip = [tx, ty, ty, 0, 0.0]
+        strip[2], strip[3], strip[4] = ty, strip[3] + count, strip[4] + entries
+    if strip is not None:
+        yield strip[:3]
+
+def entry_chunks(lengths, budget=CHUNK_SIZE):
+    # Consecutive row ranges of at most budget entries (or a single row).
+    ends = np.cumsum(lengths)
+    first = 0
+    while first < len(lengths):
+        last = max(first + 1, int(np.searchsorted(ends, (ends[first - 1] if first > 0 else 0) + budget, side="right")))
+        yield first, last
+        first = last
+
+def scatter_rows(directory, scratch, n, nnz):
+    lengths = np.zeros(n, dtype=np.int64)
+    row_ids = np.memmap(os.path.join(scratch, "row_ids.bin"), dtype=np.int64, mode="r", shape=(n,))
+    row_lengths = np.memmap(os.path.join(scratch, "row_lengths.bin"), dtype=np.int64, mode="r", shape=(n,))
+    for start, end in chunks(n):
+        lengths[row_ids[start:end]] = row_lengths[start:end]
+    indptr = open_memmap(os.path.join(directory, "indptr.npy"), mode="w+", dtype=np.int64, shape=(n + 1,))
+    indptr[0] = 0
+    np.cumsum(lengths, out=indptr[1:])
+    del lengths
+    indices_path = os.path.join(directory, "indices.npy")
+    open_memmap(indices_path, mode="w+", dtype=index_dtype(n), shape=(nnz,)).flush()
+    with open(os.path.join(scratch, "rows.bin"), "rb") as rows_file:
+        for start, end in chunks(n):
+            for first, last in entry_chunks(np.asarray(row_lengths[start:end])):
+                ids, chunk_lengths = np.asarray(row_ids[start + first:start + last]), np.asarray(row_lengths[start + first:start + last])
+                chunk = np.fromfile(rows_file, dtype=index_dtype(n), count=int(chunk_lengths.sum()))
+                offsets = np.concatenate(([0], np.cumsum(chunk_lengths)[:-1]))
+                # Mapped anew for every chunk, so written pages do not pile up
+                # in the process's resident memory.
+                indices = open_memmap(indices_path, mode="r+")
+                indices[np.repeat(indptr[ids] - offsets, chunk_lengths) + np.arange(len(chunk))] = chunk
+                del indices
+    indptr.flush()
+
+def build_instance_streaming(x, y, weight, radius, directory, maximumFacilities=None, tile_points=20000, tile_entries=1 << 22):
+    # x, y and weight may be memory-mapped (np.load(..., mmap_mode="r")).
+    # Writes the same binary instance as save_binary_instance(directory,
+    # build_instance(x, y, weight, radius, maximumFacilities)).
+    n = len(x)
+    os.makedirs(directory, exist_ok=True)
+    scratch = os.path.join(directory, "scratch")
+    os.makedirs(scratch, exist_ok=True)
+    try:
+        x = copy_column(os.path.join(directory, "x.npy"), x, float)
+        y = copy_column(os.path.join(directory, "y.npy"), y, float)
+        copy_column(os.path.join(directory, "weight.npy"), weight, np.int64).flush()
+        stats = {"strips": 0, "tile_size": None, "max_strip_points": 0, "nnz": 0}
+        if n > 0:
+            tile_size, x_min, y_min, span = choose_tile_size(x, y, radius, tile_points, tile_entries)
+            keys = tile_keys(x, y, tile_size, x_min, y_min, span)
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            del keys
+            boundaries = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1, [n]))
+            stats["tile_size"] = tile_size
+            with open(os.path.join(scratch, "row_ids.bin"), "wb") as ids_file, \
+                 open(os.path.join(scratch, "row_lengths.bin"), "wb") as lengths_file, \
+                 open(os.path.join(scratch, "rows.bin"), "wb") as rows_file:
+                for tx, first_ty, last_ty in strips(sorted_keys[boundaries[:-1]], np.diff(boundaries), span, tile_size, radius, tile_points, tile_entries):
+                    members, lengths, indices = strip_rows(x, y, radius, order, sorted_keys, tx, first_ty, last_ty, tile_size, x_min, y_min, span)
+                    ids_file.write(members.astype(np.int64).tobytes())
+                    lengths_file.write(lengths.tobytes())
+                    rows_file.write(indices.tobytes())
+                    stats["strips"] += 1
+                    stats["max_strip_points"] = max(stats["max_strip_points"], len(members))
+                    stats["nnz"] += int(lengths.sum())
+            del order, sorted_keys
+            scatter_rows(directory, scratch, n, stats["nnz"])
+        else:
+            np.save(os.path.join(directory, "indptr.npy"), np.zeros(1, dtype=np.int64))
+            np.save(os.path.join(directory, "indices.npy"), np.zeros(0, dtype=index_dtype(0)))
+    finally:
+        shutil.rmtree(scratch)
+    with open(os.path.join(directory, "meta.json"), "w") as file:
+        json.dump({"radius": radius, "maximumFacilities": maximumFacilities, "total_points": n}, file, indent=2)
+    return stats
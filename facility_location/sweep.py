@@ -0,0 +1,112 @@
+import time
+import numpy as np
+from .generator import cell_pair_distances
+from .instance_io import index_dtype
+from .coverage import coverage_counts
+from .solvers import solve_lscp, solve_mclp, GENETIC_MCLP_PARAMS
+from .genetic_mclp import num_nearest_neighbours, nearest_neighbour_matrix
+
+def sorted_neighbours(x, y, max_radius):
+    # One grid pass at the largest radius. Every row holds the neighbours of a
+    # point sorted by (distance, id), so the neighbourhood for any smaller
+    # radius is a prefix of the row.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    rows = [None] * len(x)
+    for members, candidates, distances in cell_pair_distances(x, y, max_radius):
+        for row, member in enumerate(members.tolist()):
+            within = distances[row] <= max_radius
+            neighbour_ids, neighbour_distances = candidates[within], distances[row][within]
+            order = np.lexsort((neighbour_ids, neighbour_distances))
+            rows[member] = (neighbour_ids[order], neighbour_distances[order])
+    indptr = np.zeros(len(x) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids, _ in rows], out=indptr[1:])
+    return {
+        "max_radius": max_radius,
+        "x": x,
+        "y": y,
+        "indptr": indptr,
+        "indices": np.concatenate([ids for ids, _ in rows]).astype(index_dtype(len(x))),
+        "distances": np.concatenate([distances for _, distances in rows])
+    }
+
+def truncate(neighbours, radius):
+    if radius > neighbours["max_radius"]:
+        raise ValueError(f"Radius {radius} exceeds the sweep maximum {neighbours['max_radius']}")
+    indptr, indices = neighbours["indptr"], neighbours["indices"]
+    n = len(indptr) - 1
+    # Rows are sorted by distance, so the kept entries are a prefix of each row.
+    kept = np.flatnonzero(neighbours["distances"] <= radius)
+    rows = np.repeat(np.arange(n), np.diff(indptr))[kept]
+    # Rows of a built instance are sorted by id.
+    order = np.lexsort((indices[kept], rows))
+    truncated_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=truncated_indptr[1:])
+    return truncated_indptr, indices[kept][order]
+
+def instance_at_radius(neighbours, weight, radius, maximumFacilities=None):
+    indptr, indices = truncate(neighbours, radius)
+    return {
+        "radius": radius,
+        "maximumFacilities": maximumFacilities,
+        "total_points": len(indptr) - 1,
+        "x": neighbours["x"],
+        "y": neighbours["y"],
+        "weight": np.asarray(weight, dtype=np.int64),
+        "indptr": indptr,
+        "indices": indices
+    }
+
+def objective_of(problem, solution):
+    return solution["total_weight"] if problem == "LSCP" else solution["total_points_covered"]
+
+def is_better(problem, candidate, incumbent):
+    if problem == "LSCP":
+        return objective_of(problem, candidate) < objective_of(problem, incumbent)
+    return objective_of(problem, candidate) > objective_of(problem, incumbent)
+
+def solve_at_radius(instance, problem, method, maximumFacilities, previous, seed, params):
+    if method == "genetic":
+        params = dict(params or {}, warm_start=previous)
+        if problem == "LSCP":
+            return solve_lscp(instance, "genetic", seed=seed, params=params)
+        return solve_mclp(instance, maximumFacilities, "genetic", seed=seed, params=params)
+    if problem == "LSCP":
+        solution = solve_lscp(instance, method)
+    else:
+        solution = solve_mclp(instance, maximumFacilities, method)
+    # Greedy has no start solution; instead the previous radius's facilities
+    # are kept when they do better here. Evaluating them is one pass over
+    # their rows, where repairing and improving them cost more than the solve.
+    if previous is not None:
+        counts = coverage_counts(instance, previous, instance["total_points"])
+        if problem == "LSCP":
+            kept = {"result": previous, "total_weight": int(instance["weight"][previous].sum())} if counts.all() else None
+        else:
+            kept = {"result": previous, "total_points_covered": int(np.count_nonzero(counts))}
+        if kept is not None and is_better(problem, kept, solution):
+            solution = kept
+    return solution
+
+def run_sweep(x, y, weight, radii, problem, method="greedy", maximumFacilities=None, seed=None, params=None, warm_start=True):
+    start_time = time.perf_counter()
+    neighbours = sorted_neighbours(x, y, max(radii))
+    if problem == "MCLP" and method == "genetic":
+        # The mutation neighbours depend on the coordinates only, so one
+        # matrix serves every radius.
+        percentage = dict(GENETIC_MCLP_PARAMS, **(params or {}))["percentage_nearest_neighbours"]
+        params = dict(params or {}, nearest=nearest_neighbour_matrix(neighbours["x"], neighbours["y"], num_nearest_neighbours(len(neighbours["x"]), percentage)))
+    sweep = {"problem": problem, "method": method, "maximumFacilities": maximumFacilities, "distance_time": time.perf_counter() - start_time, "results": []}
+    previous = None
+    for radius in radii:
+        start_time = time.perf_counter()
+        instance = instance_at_radius(neighbours, weight, radius, maximumFacilities)
+        solution = solve_at_radius(instance, problem, method, maximumFacilities, previous if warm_start else None, seed, params)
+        sweep["results"].append({
+            "radius": radius,
+            "result": [int(facility) for facility in solution["result"]],
+            "objective": float(objective_of(problem, solution)),
+            "wall_time": time.perf_counter() - start_time
+        })
+        previous = solution["result"]
+    return sweep
@@ -0,0 +1,27 @@
+import argparse
+from facility_location.instance_io import load_instance, default_instance_path
+from facility_location.plotting import load_solution, render
+
+# Replaces plot_with_radius.py, plot_without_radius.py and the six
+# plot_with_radius_filled_*.py scripts, e.g.
+#   python plot_solution.py --solution greedy_solution_LSCP.json
+#   python plot_solution.py --no-radii
+#   python plot_solution.py big_instance_bin --solution genetic_solution_MCLP.json --density --output big.png
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plot an instance and, optionally, a solution with filled coverage circles.")
+    parser.add_argument("instance", nargs="?", default=default_instance_path(), help="JSON file or binary instance directory (default: the current population_points instance)")
+    parser.add_argument("--solution", help="solution JSON whose facilities are drawn with filled circles")
+    parser.add_argument("--no-radii", action="store_true", help="draw the points only")
+    parser.add_argument("--labels", type=int, default=200, help="maximum number of id labels, -1 for all, 0 for none")
+    parser.add_argument("--density", action="store_true", help="draw a density layer instead of individual points")
+    parser.add_argument("--output", help="write a PNG/SVG file instead of opening a window")
+    args = parser.parse_args()
+
+    instance = load_instance(args.instance)
+    selected = None
+    title = None
+    if args.solution:
+        selected = load_solution(args.solution)
+        title = f"Population Points with Radii (Total Points: {instance['total_points']}, Solution: {args.solution})"
+    render(instance, selected, not args.no_radii, None if args.labels < 0 else args.labels, args.density, args.output, title)
@@ -0,0 +1,25 @@
+import json
+import time
+from facility_location import load_instance, default_instance_path
+from facility_location.sweep import run_sweep
+
+if __name__ == "__main__":
+    instance_path = default_instance_path()
+    instance = load_instance(instance_path)
+    radii = [50, 75, 100, 125, 150, 175, 200, 225, 250]
+    problem = "MCLP"
+    method = "greedy"
+    maximumFacilities = instance["maximumFacilities"]
+    seed = None
+    warm_start = True
+
+    start_time = time.perf_counter()
+    sweep = run_sweep(instance["x"], instance["y"], instance["weight"], radii, problem, method, maximumFacilities, seed, warm_start=warm_start)
+    end_time = time.perf_counter()
+
+    with open(f"sweep_solution_{problem}.json", "w") as file:
+        json.dump(sweep, file, indent=2)
+
+    for result in sweep["results"]:
+        print("Radius:", result["radius"], "Objective:", result["objective"])
+    print("Elapsed time:", end_time - start_time)
@@ -0,0 +1,46 @@
+import pytest
+from facility_location.generator import generate_population_columns, build_instance
+from facility_location.solvers import solve_lscp, solve_mclp
+
+class Interrupted(Exception):
+    pass
+
+def interrupt_at(generation):
+    def hook(record):
+        if record["generation"] >= generation:
+            raise Interrupted()
+    return {"generation": hook}
+
+def make_instance(seed=0):
+    x, y, weight = generate_population_columns(150, seed)
+    return build_instance(x, y, weight, 60, 5)
+
+def lscp(instance, seed=3, **params):
+    return solve_lscp(instance, "genetic", "matrix", seed=seed, params=dict({"initialSolutions": 20, "Mutations": 300, "target_gap": None}, **params))
+
+def mclp(instance, seed=3, **params):
+    return solve_mclp(instance, 5, "genetic", "bitset", seed=seed, params=dict({"target_gap": None}, **params))
+
+@pytest.mark.parametrize("solve", [lscp, mclp])
+def test_resume_matches_uninterrupted_run(solve, tmp_path):
+    instance = make_instance()
+    checkpoint_file = str(tmp_path / "run.checkpoint.npz")
+    expected = solve(instance)
+    with pytest.raises(Interrupted):
+        solve(instance, checkpoint_file=checkpoint_file, checkpoint_interval=20, hooks=[interrupt_at(50)])
+    # The generator state comes from the checkpoint, not from the seed.
+    resumed = solve(instance, seed=99, checkpoint_file=checkpoint_file, checkpoint_interval=20, resume=True)
+    assert resumed == expected
+
+@pytest.mark.parametrize("solve", [lscp, mclp])
+def test_resume_rejects_changed_instance(solve, tmp_path):
+    instance = make_instance()
+    checkpoint_file = str(tmp_path / "run.checkpoint.npz")
+    with pytest.raises(Interrupted):
+        solve(instance, checkpoint_file=checkpoint_file, checkpoint_interval=20, hooks=[interrupt_at(50)])
+    # Same number of points, one point moved.
+    instance["x"] = instance["x"].copy()
+    instance["x"][0] += 200
+    changed = build_instance(instance["x"], instance["y"], instance["weight"], 60, 5)
+    with pytest.raises(ValueError, match="different instance"):
+        solve(changed, checkpoint_file=checkpoint_file, checkpoint_interval=20, resume=True)
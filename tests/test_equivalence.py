@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from facility_location.generator import generate_population_columns, columns_to_points, all_points_with_radii
+from facility_location.instance_io import points_data_to_arrays
+from facility_location.coverage import coverage_index
+from facility_location.genetic_lscp import heuristic_feasibility_operator, heuristic_feasibility_operator_csr
+from facility_location import greedy_lscp, greedy_mclp
+
+# The vectorized operators and greedy variants must make the same decisions
+# as the list-based originals they replace.
+
+def make_instance(num_points, radius, seed):
+    x, y, weight = generate_population_columns(num_points, seed)
+    data = all_points_with_radii(columns_to_points(x, y, weight), radius, total_points=num_points, maximumFacilities=5)
+    return data, points_data_to_arrays(data)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [0, 60, 150])
+def test_feasibility_operator_csr_matches_original(seed, radius):
+    data, instance = make_instance(150, radius, seed)
+    weights = np.asarray(instance["weight"])
+    coverage = coverage_index(instance["indptr"], instance["indices"], len(weights), weights)
+    rng = np.random.default_rng(seed)
+    for density in (0.0, 0.05, 0.3, 1.0):
+        child_solution = (rng.random(len(weights)) < density).astype(int).tolist()
+        expected = heuristic_feasibility_operator(data["points_data"], list(child_solution))
+        assert heuristic_feasibility_operator_csr(child_solution, weights, coverage).tolist() == list(expected)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [0, 60, 150])
+def test_lazy_greedy_lscp_matches_original(seed, radius):
+    data, instance = make_instance(150, radius, seed)
+    assert greedy_lscp.lazy_greedy_set_covering(instance) == greedy_lscp.greedy_set_covering(data["points_data"])
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [0, 60, 150])
+@pytest.mark.parametrize("maximumFacilities", [1, 5, 200])
+def test_incremental_greedy_mclp_matches_original(seed, radius, maximumFacilities):
+    data, instance = make_instance(150, radius, seed)
+    assert greedy_mclp.incremental_greedy_set_covering(instance, maximumFacilities) == greedy_mclp.greedy_set_covering(data["points_data"], maximumFacilities)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from facility_location.generator import generate_population_columns, columns_to_points, check_points_within_radius, build_instance
+from facility_location.instance_io import load_instance
+from facility_location.streaming import build_instance_streaming
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [0, 10, 60, 125])
+def test_grid_matches_brute_force(seed, radius):
+    x, y, weight = generate_population_columns(400, seed)
+    assert check_points_within_radius(columns_to_points(x, y, weight), radius) == []
+
+@pytest.mark.parametrize("radius", [0, 1, 2.5])
+def test_grid_matches_brute_force_on_ties(radius):
+    # Lattice points lie exactly on the radius and on the cell borders, and
+    # every point appears twice.
+    x, y = np.meshgrid(np.arange(10.0), np.arange(10.0))
+    x, y = np.tile(x.ravel(), 2), np.tile(y.ravel(), 2)
+    assert check_points_within_radius(columns_to_points(x, y, np.ones(len(x), dtype=np.int64)), radius) == []
+
+@pytest.mark.parametrize("seed, radius", [(0, 0), (1, 15), (2, 60)])
+@pytest.mark.parametrize("tile_points, tile_entries", [(50, 2000), (300, 1 << 22)])
+def test_streaming_matches_build_instance(tmp_path, seed, radius, tile_points, tile_entries):
+    x, y, weight = generate_population_columns(3000, seed)
+    expected = build_instance(x, y, weight, radius, 5)
+    stats = build_instance_streaming(x, y, weight, radius, str(tmp_path / "instance"), 5, tile_points, tile_entries)
+    assert stats["strips"] > 1
+    instance = load_instance(str(tmp_path / "instance"))
+    for field in ("radius", "maximumFacilities", "total_points"):
+        assert instance[field] == expected[field]
+    for field in ("x", "y", "weight", "indptr", "indices"):
+        assert np.array_equal(instance[field], expected[field])
+    assert instance["indices"].dtype == expected["indices"].dtype
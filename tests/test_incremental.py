@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from facility_location.generator import generate_population_columns, build_instance
+from facility_location.coverage import coverage_counts
+from facility_location.greedy_lscp import lazy_greedy_set_covering
+from facility_location.incremental import dynamic_instance, apply_changes, export_instance, reoptimize_lscp, reoptimize_mclp
+
+# After any batch of changes the dynamic instance must describe exactly the
+# instance a rebuild from the surviving points would give.
+
+def random_changes(rng, dynamic, num_changes):
+    changes, alive, next_id = [], sorted(dynamic["points"]), dynamic["next_id"]
+    for _ in range(num_changes):
+        op = rng.choice(["insert", "move", "delete"])
+        x, y = rng.uniform(0, 1000, 2).tolist()
+        if op == "insert":
+            changes.append({"op": "insert", "x": x, "y": y, "weight": int(rng.integers(1, 100))})
+            alive.append(next_id)
+            next_id += 1
+        elif op == "move":
+            changes.append({"op": "move", "id": int(rng.choice(alive)), "x": x, "y": y})
+        else:
+            point_id = alive.pop(rng.integers(len(alive)))
+            changes.append({"op": "delete", "id": point_id})
+    return changes
+
+def rebuilt(dynamic):
+    instance, ids = export_instance(dynamic)
+    return instance, ids, build_instance(instance["x"], instance["y"], instance["weight"], instance["radius"], instance["maximumFacilities"])
+
+def assert_same_instance(instance, expected):
+    for field in ("radius", "maximumFacilities", "total_points"):
+        assert instance[field] == expected[field]
+    for field in ("x", "y", "weight", "indptr", "indices"):
+        assert np.array_equal(instance[field], expected[field]), field
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [0, 40, 120])
+def test_changes_match_rebuild(seed, radius):
+    x, y, weight = generate_population_columns(400, seed)
+    dynamic = dynamic_instance(build_instance(x, y, weight, radius, 5))
+    rng = np.random.default_rng(seed)
+    for _ in range(3):
+        apply_changes(dynamic, random_changes(rng, dynamic, 40))
+        instance, ids, expected = rebuilt(dynamic)
+        assert_same_instance(instance, expected)
+        # A dynamic instance round-trips through export unchanged.
+        assert_same_instance(export_instance(dynamic_instance(instance))[0], expected)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [40, 120])
+def test_reoptimized_solutions_are_valid_on_rebuild(seed, radius):
+    x, y, weight = generate_population_columns(400, seed)
+    instance = build_instance(x, y, weight, radius, 5)
+    previous_lscp = lazy_greedy_set_covering(instance)["result"]
+    previous_mclp = list(range(5))
+    dynamic = dynamic_instance(instance)
+    apply_changes(dynamic, random_changes(np.random.default_rng(seed), dynamic, 60))
+    instance, ids, expected = rebuilt(dynamic)
+    position = {point_id: i for i, point_id in enumerate(ids)}
+
+    lscp = reoptimize_lscp(dynamic, previous_lscp, time_limit=5, exported=(instance, ids))
+    selected = [position[facility] for facility in lscp["result"]]
+    assert coverage_counts(expected, selected, len(ids)).min() >= 1
+    assert lscp["total_weight"] == expected["weight"][selected].sum()
+    assert lscp == reoptimize_lscp(dynamic, previous_lscp, time_limit=5)
+
+    for weighted in (False, True):
+        mclp = reoptimize_mclp(dynamic, previous_mclp, weighted=weighted, time_limit=5)
+        selected = [position[facility] for facility in mclp["result"]]
+        assert len(set(selected)) == len(selected) <= 5
+        covered = coverage_counts(expected, selected, len(ids)) > 0
+        assert mclp["total_points_covered"] == (expected["weight"][covered].sum() if weighted else covered.sum())
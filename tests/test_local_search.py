@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from facility_location.generator import generate_population_columns, build_instance
+from facility_location.local_search import search_context, init_mclp_tables, add_facility_mclp, remove_facility_mclp, refresh_extras, slot_extras, init_lscp_tables, add_facility_lscp, remove_facility_lscp
+
+# The move helpers update the tables incrementally; after any sequence of
+# swaps they must agree with tables built from scratch for the same facilities.
+
+def random_swaps(rng, n, selected, num_swaps):
+    selected = list(selected)
+    for _ in range(num_swaps):
+        removed = selected.pop(rng.integers(len(selected)))
+        added = int(rng.choice(np.setdiff1d(np.arange(n), selected + [removed])))
+        selected.append(added)
+        yield removed, added, list(selected)
+
+def extras_by_facility(tables, selected):
+    return {facility: tables["extras"][tables["slot"][facility]] for facility in selected}
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [0, 40, 120])
+def test_mclp_tables_match_rebuild(seed, radius):
+    x, y, weight = generate_population_columns(300, seed)
+    context = search_context(build_instance(x, y, weight, radius))
+    demand = context["weight"]
+    rng = np.random.default_rng(seed)
+    selected = rng.choice(context["n"], 8, replace=False).tolist()
+    tables = init_mclp_tables(context, selected, demand, 8)
+    refresh_extras(context, tables, demand)
+    for removed, added, selected in random_swaps(rng, context["n"], selected, 25):
+        remove_facility_mclp(context, tables, removed, demand)
+        add_facility_mclp(context, tables, added, demand)
+        expected = init_mclp_tables(context, selected, demand, 8)
+        for field in ("count", "owner", "gain", "loss", "selected"):
+            assert np.array_equal(tables[field], expected[field]), field
+        refresh_extras(context, tables, demand)
+        for facility, (listed, extra) in extras_by_facility(tables, selected).items():
+            expected_listed, expected_extra = slot_extras(context, expected, facility, demand)
+            assert np.array_equal(listed, expected_listed)
+            assert np.array_equal(extra, expected_extra)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [0, 40, 120])
+def test_lscp_tables_match_rebuild(seed, radius):
+    x, y, weight = generate_population_columns(300, seed)
+    context = search_context(build_instance(x, y, weight, radius))
+    rng = np.random.default_rng(seed)
+    selected = rng.choice(context["n"], 40, replace=False).tolist()
+    tables = init_lscp_tables(context, selected)
+    for removed, added, selected in random_swaps(rng, context["n"], selected, 25):
+        remove_facility_lscp(context, tables, removed)
+        add_facility_lscp(context, tables, added)
+        expected = init_lscp_tables(context, selected)
+        for field in ("count", "owner", "unique", "selected"):
+            assert np.array_equal(tables[field], expected[field]), field
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from facility_location.generator import generate_population_columns, build_instance
+from facility_location.presolve import row_and_column_sets, fix_essential_columns, remove_dominated_rows, remove_dominated_columns, presolve_set_cover
+from facility_location.coverage import coverage_counts
+from facility_location import exact_lscp
+
+def csr(rows):
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+    return indptr, np.array([j for row in rows for j in row], dtype=np.int64)
+
+def test_essential_columns_are_fixed():
+    rows, columns = row_and_column_sets(*csr([[1], [0, 1], [0, 2], [2]]))
+    fixed = []
+    assert fix_essential_columns(rows, columns, fixed)
+    assert sorted(fixed) == [1, 2]
+    assert rows == {}
+
+def test_superset_rows_are_removed():
+    rows, columns = row_and_column_sets(*csr([[0, 1], [0, 1, 2], [2, 3], [0, 3], [2, 3]]))
+    assert remove_dominated_rows(rows, columns)
+    # row 1 contains row 0, row 4 equals row 2 and has the higher id
+    assert sorted(rows) == [0, 2, 3]
+    assert all(i not in column for column in columns.values() for i in (1, 4))
+
+def test_dominated_columns_respect_weights():
+    # facility 1 covers a subset of facility 0, facility 3 a subset of facility 2
+    rows, columns = row_and_column_sets(*csr([[0, 1], [0], [2, 3], [2]]))
+    assert remove_dominated_columns(rows, columns, [1, 1, 5, 1])
+    assert 1 not in columns
+    assert 3 in columns
+    # unused facilities are dropped as well
+    rows, columns = row_and_column_sets(*csr([[0], [0], [0], [0]]))
+    assert remove_dominated_columns(rows, columns, [1, 1, 1, 1])
+    assert list(columns) == [0]
+
+def test_presolve_maps_back_to_a_cover():
+    indptr, indices = csr([[0, 1], [0, 1, 2], [2, 3], [0, 3]])
+    presolved = presolve_set_cover(indptr, indices, [1, 1, 1, 1])
+    assert presolved["fixed"] == [0, 3]
+    assert presolved["stats"]["rows"] == 0
+
+def test_presolve_rejects_uncoverable_rows():
+    with pytest.raises(ValueError):
+        presolve_set_cover(*csr([[0], []]), [1, 1])
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("radius", [40, 90])
+def test_presolved_optimum_matches_full_model(seed, radius):
+    x, y, weight = generate_population_columns(200, seed)
+    instance = build_instance(x, y, weight, radius)
+    full = exact_lscp.set_covering(instance, presolve=False, msg=False)
+    reduced = exact_lscp.set_covering(instance, presolve=True, msg=False)
+    assert reduced["status"] == full["status"] == "Optimal solution found"
+    assert reduced["total_weight"] == full["total_weight"]
+    counts = coverage_counts(instance, reduced["result"], len(weight))
+    assert counts.min() >= 1
@@ -0,0 +1,18 @@
+from facility_location import genetic_mclp
+from facility_location.generator import generate_population_columns
+from facility_location.solvers import solve_mclp
+from facility_location.sweep import run_sweep, sorted_neighbours, instance_at_radius
+
+def test_genetic_sweep_computes_neighbours_once(monkeypatch):
+    x, y, weight = generate_population_columns(300, 0)
+    radii = [30, 60]
+    expected = solve_mclp(instance_at_radius(sorted_neighbours(x, y, 60), weight, 30, 5), 5, "genetic", seed=1)
+
+    def recomputed(*args, **kwargs):
+        raise AssertionError("neighbour matrix recomputed per radius")
+    # The sweep computes the matrix itself before any radius is solved; the
+    # solver must take it from params instead of calling this.
+    monkeypatch.setattr(genetic_mclp, "nearest_neighbour_matrix", recomputed)
+    sweep = run_sweep(x, y, weight, radii, "MCLP", "genetic", 5, seed=1)
+    assert [result["radius"] for result in sweep["results"]] == radii
+    assert sweep["results"][0]["result"] == expected["result"]
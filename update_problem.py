@@ -0,0 +1,55 @@
+import json
+import os
+import time
+from facility_location.instance_io import load_instance, arrays_to_points_data, save_binary_instance, default_instance_path, INSTANCE_FILE, INSTANCE_DIRECTORY
+from facility_location.incremental import dynamic_instance, apply_changes, export_instance, reoptimize_lscp, reoptimize_mclp
+
+if __name__ == "__main__":
+    instance_path = default_instance_path()
+    changes_file = "changes.json"
+    # Re-optimized exact solutions are heuristic results on the new instance,
+    # so they go to their own files and the exact ones are removed. Listed
+    # after reoptimized_*, so a fresh exact solution wins over an older one.
+    solution_files = {f"{method}_solution_{problem}.json": f"{target}_solution_{problem}.json" for method, target in (("reoptimized", "reoptimized"), ("exact", "reoptimized"), ("greedy", "greedy"), ("genetic", "genetic")) for problem in ("LSCP", "MCLP")}
+
+    with open(changes_file, "r") as file:
+        changes = json.load(file)
+
+    start_time = time.perf_counter()
+    dynamic = dynamic_instance(load_instance(instance_path))
+    affected = apply_changes(dynamic, changes)
+    instance, ids = export_instance(dynamic)
+    position = {point_id: i for i, point_id in enumerate(ids)}
+
+    # Solutions are re-optimized from the previous ones instead of re-solved.
+    solutions = {}
+    for solution_file, target_file in solution_files.items():
+        if not os.path.exists(solution_file):
+            continue
+        with open(solution_file, "r") as file:
+            previous = json.load(file)["result"]
+        if "LSCP" in solution_file:
+            solution = reoptimize_lscp(dynamic, previous, exported=(instance, ids))
+        else:
+            solution = reoptimize_mclp(dynamic, previous, exported=(instance, ids))
+            solution["total_points_covered"] = float(solution["total_points_covered"])
+        solution["result"] = [position[facility] for facility in solution["result"]]
+        solution["reoptimized_from"] = solution_file
+        solutions[target_file] = solution
+    end_time = time.perf_counter()
+
+    # The JSON copy is kept in sync where there is one; streamed instances
+    # only have the binary directory.
+    if os.path.exists(INSTANCE_FILE):
+        with open(INSTANCE_FILE, "w") as file:
+            json.dump(arrays_to_points_data(instance), file, indent=2)
+    save_binary_instance(INSTANCE_DIRECTORY, instance)
+    for solution_file, solution in solutions.items():
+        with open(solution_file, "w") as file:
+            json.dump(solution, file, indent=2)
+    for problem in ("LSCP", "MCLP"):
+        if f"reoptimized_solution_{problem}.json" in solutions and os.path.exists(f"exact_solution_{problem}.json"):
+            os.remove(f"exact_solution_{problem}.json")
+
+    print("Changes:", len(changes), "Affected points:", len(affected))
+    print("Elapsed time:", end_time - start_time)